@@ -1,6 +1,14 @@
 #資料結構部分
+#Point、VoronoiVertex、VoronoiEdge 等大量產生的物件都用 __slots__，不帶每個物件各自的 __dict__
+import contextvars
+import math
+import weakref
+from array import array
+from predicates import cross, orient2d
 
 class Point:
+    __slots__ = ('x', 'y')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -17,15 +25,48 @@ class Point:
         return f"Point({self.x}, {self.y})"
 
 class VoronoiVertex:
-    def __init__(self, x, y):
+    __slots__ = ('x', 'y', 'edges', 'sites')
+
+    def __init__(self, x, y, sites=None):
         self.x = x
         self.y = y
-        self.edges = []  # 連接到這個 vertex 的中垂線列表
+        self.edges = []  # 連接到這個 vertex 的中垂線列表（所有相接的邊共用同一個 vertex 物件）
+        # 定義此 vertex 的三個 site（外心所屬的三角形）；中垂線延伸出去的遠端點為 None
+        self.sites = tuple(sites) if sites else None
+
+    @property
+    def degree(self):
+        return len(self.edges)
 
     def add_edge(self, edge):
         self.edges.append(edge)
 
+    def remove_edge(self, edge):
+        if edge in self.edges:
+            self.edges.remove(edge)
+
+    def third_site(self, site1, site2):
+        """回傳定義此 vertex 的 site 中，除了 site1、site2 以外的那一個"""
+        if not self.sites:
+            return None
+        for site in self.sites:
+            if site != site1 and site != site2:
+                return site
+        return None
+
 class VoronoiEdge:
+    __slots__ = ('site1', 'site2', 'start_vertex', 'end_vertex', 'is_infinite', 'is_hyperplane',
+                 'a', 'b', 'c', 'life', 'is_cross', 'cross_point', 'intersected_by_hyperplane',
+                 'half_edge', '__weakref__')
+
+    # 只用在顯示/調試的資訊（外心、是否為原始中垂線等）不佔每條邊的欄位，
+    # 開啟追蹤（set_tracing）時才記錄在 edge -> {名稱: 值} 的對照表；
+    # 對照表放在 ContextVar，只在開啟追蹤的執行環境（例如記錄步驟的建構）中有效
+    _trace = contextvars.ContextVar('VoronoiEdge._trace', default=None)
+    # 記錄步驟時由 StepLog 放入一個 set，端點被改變的邊會加入其中（None 表示不記錄）；
+    # 用 ContextVar 而不是類別屬性，每個執行緒／建構各自記錄，不會互相覆蓋
+    _changed = contextvars.ContextVar('VoronoiEdge._changed', default=None)
+
     def __init__(self, site1, site2, is_hyperplane=False):
         self.site1 = site1  # 平分的第一個點
         self.site2 = site2  # 平分的第二個點
@@ -33,8 +74,8 @@ class VoronoiEdge:
         self.end_vertex = None
         self.is_infinite = False
         self.is_hyperplane = is_hyperplane  # 標記是否為hyperplane（midAB線段）
-        self.slope = self._calculate_slope()  # 中垂線的斜率
-        self.midpoint = self._calculate_midpoint()  # 中垂線經過的中點
+        # 中垂線 a·x + b·y = c，(a, b) 為垂直於中垂線的單位向量，建立時算一次
+        self.a, self.b, self.c = self._calculate_line()
         
         # 邊生命值系統
         self.life = 2  # 每條邊有2條命（對應兩個端點）
@@ -44,11 +85,56 @@ class VoronoiEdge:
         self.cross_point = None  # 記錄碰撞點
         self.intersected_by_hyperplane = None  # 記錄被哪條hyperplane碰撞
         
-        # 外心信息
-        self.circumcenter = None  # 記錄外心位置
-    
-    # ...existing code...
+        # 半邊結構：指向 site1 那一側的半邊（另一側用 twin 取得）
+        self.half_edge = None
     
+    @classmethod
+    def set_tracing(cls, enabled):
+        """在目前的執行環境開啟（True）或關閉（False）調試資訊的記錄，也可以直接指定要使用的對照表；
+        回傳 token，交給 reset_tracing 還原原本的設定"""
+        if enabled is True:
+            table = cls._trace.get()
+            if table is None:
+                table = weakref.WeakKeyDictionary()
+        elif enabled is False:
+            table = None
+        else:
+            table = enabled
+        return cls._trace.set(table)
+
+    @classmethod
+    def reset_tracing(cls, token):
+        """還原 set_tracing 之前的設定"""
+        cls._trace.reset(token)
+
+    def get_debug(self, name, default=None):
+        table = VoronoiEdge._trace.get()
+        if table is None:
+            return default
+        return table.get(self, {}).get(name, default)
+
+    def set_debug(self, name, value):
+        """記錄調試資訊，沒有開啟追蹤時直接忽略"""
+        table = VoronoiEdge._trace.get()
+        if table is not None:
+            table.setdefault(self, {})[name] = value
+
+    @classmethod
+    def track_changes(cls, changed):
+        """在目前的執行環境中，之後端點被改變的邊都加入 changed（set），傳 None 停止記錄；
+        回傳 token，交給 untrack_changes 還原原本的設定"""
+        return cls._changed.set(changed)
+
+    @classmethod
+    def untrack_changes(cls, token):
+        """還原 track_changes 之前的設定"""
+        cls._changed.reset(token)
+
+    @property
+    def circumcenter(self):
+        """外心位置（調試資訊，沒有追蹤時為 None）"""
+        return self.get_debug('circumcenter')
+
     def set_cross_info(self, cross_point, hyperplane):
         """設置碰撞信息"""
         self.is_cross = True
@@ -56,18 +142,35 @@ class VoronoiEdge:
         self.intersected_by_hyperplane = hyperplane
     
     def get_point_value_in_hyperplane_equation(self, point, hyperplane):
-        """計算點在hyperplane直線方程式中的值"""
-        if hyperplane.slope == float('inf'):
-            # 垂直線: x = c
-            # 方程式可以寫成 x - c = 0
-            c = hyperplane.midpoint.x
-            return point.x - c
-        else:
-            # 一般直線: y = mx + b，重寫為 mx - y + b = 0
-            m = hyperplane.slope
-            b = hyperplane.midpoint.y - m * hyperplane.midpoint.x
-            return m * point.x - point.y + b
-    
+        """計算點在hyperplane直線方程式中的值（a·x + b·y - c，即到直線的有號距離）"""
+        return hyperplane.a * point.x + hyperplane.b * point.y - hyperplane.c
+
+    def _calculate_line(self):
+        """計算中垂線的正規化係數 (a, b, c)"""
+        dx = self.site2.x - self.site1.x
+        dy = self.site2.y - self.site1.y
+        length = math.hypot(dx, dy)
+        if length == 0:
+            return 0.0, 0.0, 0.0
+        # 法向量固定取 b < 0（水平的 site 連線取 a > 0），代入方程式的正負號與 y = mx + b 的寫法一致
+        if dy > 0 or (dy == 0 and dx < 0):
+            length = -length
+        a = dx / length
+        b = dy / length
+        # 用中點代入求 c，避免 |p2|² - |p1|² 相減時的抵銷誤差
+        c = a * (self.site1.x + self.site2.x) / 2 + b * (self.site1.y + self.site2.y) / 2
+        return a, b, c
+
+    @property
+    def slope(self):
+        """中垂線的斜率（只用在顯示）"""
+        return self._calculate_slope()
+
+    @property
+    def midpoint(self):
+        """中垂線經過的中點（只用在顯示）"""
+        return self._calculate_midpoint()
+
     def _calculate_slope(self):
         """計算中垂線的斜率"""
         dx = self.site2.x - self.site1.x
@@ -90,12 +193,23 @@ class VoronoiEdge:
         return Point(mx, my)
 
     def set_start_vertex(self, vertex):
+        # 從舊的 vertex 脫離，讓每個 vertex 的 edges 只包含真正相接的邊
+        if self.start_vertex is not None:
+            self.start_vertex.remove_edge(self)
         self.start_vertex = vertex
         vertex.add_edge(self)
+        changed = VoronoiEdge._changed.get()
+        if changed is not None:
+            changed.add(self)
 
     def set_end_vertex(self, vertex):
+        if self.end_vertex is not None:
+            self.end_vertex.remove_edge(self)
         self.end_vertex = vertex
         vertex.add_edge(self)
+        changed = VoronoiEdge._changed.get()
+        if changed is not None:
+            changed.add(self)
 
     def set_infinite(self):
         self.is_infinite = True
@@ -127,43 +241,20 @@ class VoronoiEdge:
                 return f"y = {self.slope:.4f}x - {abs(b):.4f}"
     
     def find_intersection(self, other_edge):
-        """找到兩條中垂線的交點"""
-        # 如果兩條線都是垂直線
-        if self.slope == float('inf') and other_edge.slope == float('inf'):
+        """找到兩條中垂線的交點，回傳 (x, y)；平行時回傳 None"""
+        # 兩條中垂線平行 <=> 兩組 site 連線平行，用精確的外積判斷
+        if cross(self.site2.x - self.site1.x, self.site2.y - self.site1.y,
+                 other_edge.site2.x - other_edge.site1.x, other_edge.site2.y - other_edge.site1.y) == 0:
             return None  # 平行線，無交點
-        
-        # 如果其中一條是垂直線
-        if self.slope == float('inf'):
-            x = self.midpoint.x
-            # 計算 other_edge 在 x 處的 y 值
-            b2 = other_edge.midpoint.y - other_edge.slope * other_edge.midpoint.x
-            y = other_edge.slope * x + b2
-            return Point(x, y)
-        
-        if other_edge.slope == float('inf'):
-            x = other_edge.midpoint.x
-            # 計算 self 在 x 處的 y 值
-            b1 = self.midpoint.y - self.slope * self.midpoint.x
-            y = self.slope * x + b1
-            return Point(x, y)
-        
-        # 兩條線都不是垂直線
-        # 計算 y = m1*x + b1 和 y = m2*x + b2 的交點
-        b1 = self.midpoint.y - self.slope * self.midpoint.x
-        b2 = other_edge.midpoint.y - other_edge.slope * other_edge.midpoint.x
-        
-        # 如果斜率相同，則平行
-        if abs(self.slope - other_edge.slope) < 1e-10:
-            return None
-        
-        # 求交點：m1*x + b1 = m2*x + b2 → x = (b2-b1)/(m1-m2)
-        x = (b2 - b1) / (self.slope - other_edge.slope)
-        y = self.slope * x + b1
-        
-        return Point(x, y)
+
+        # 解 a1·x + b1·y = c1、a2·x + b2·y = c2（Cramer's rule）
+        a1, b1, c1 = self.a, self.b, self.c
+        a2, b2, c2 = other_edge.a, other_edge.b, other_edge.c
+        det = a1 * b2 - a2 * b1
+        return (c1 * b2 - c2 * b1) / det, (a1 * c2 - a2 * c1) / det
     
-    def is_point_between_vertices(self, point):
-        """檢查點是否在線段的兩個端點之間"""
+    def is_point_between_vertices(self, x, y):
+        """檢查點 (x, y) 是否在線段的兩個端點之間"""
         if not self.start_vertex or not self.end_vertex:
             return False
         
@@ -175,8 +266,8 @@ class VoronoiEdge:
         
         # 給一點容差以避免浮點數精度問題
         tolerance = 1e-6
-        return (min_x - tolerance <= point.x <= max_x + tolerance and 
-                min_y - tolerance <= point.y <= max_y + tolerance)
+        return (min_x - tolerance <= x <= max_x + tolerance and 
+                min_y - tolerance <= y <= max_y + tolerance)
 
 
     #計算中垂線
@@ -253,6 +344,191 @@ class VoronoiEdge:
             return (VoronoiVertex(start_x, start_y), VoronoiVertex(end_x, end_y))
 
 
+# 半邊（DCEL）資料結構
+class HalfEdge:
+    """Voronoi 邊其中一側的有向半邊
+
+    face 的 site 永遠在 origin -> destination 的左側（外積 > 0），
+    沿著 next 走就是繞著該 cell 的邊界依外積 > 0 的方向前進。
+    無界的 cell 在射線處斷開，斷開位置的 next / prev 為 None。
+    """
+    __slots__ = ('edge', 'origin', 'face', 'twin', 'next', 'prev')
+
+    def __init__(self, edge, origin, face):
+        self.edge = edge      # 所屬的 VoronoiEdge
+        self.origin = origin  # 起點（VoronoiVertex）
+        self.face = face      # 左側的 Face
+        self.twin = None      # 反方向、屬於相鄰 cell 的半邊
+        self.next = None
+        self.prev = None
+
+    @property
+    def destination(self):
+        return self.twin.origin
+
+    def __repr__(self):
+        return f"HalfEdge(({self.origin.x:.2f}, {self.origin.y:.2f}) -> ({self.destination.x:.2f}, {self.destination.y:.2f}))"
+
+class Face:
+    """一個 site 的 Voronoi cell，half_edge 指向邊界上的任一半邊（無界時指向邊界鏈的起點）"""
+    __slots__ = ('site', 'half_edge')
+
+    def __init__(self, site):
+        self.site = site
+        self.half_edge = None
+
+    def is_unbounded(self):
+        return self.half_edge is not None and self.half_edge.prev is None
+
+    def boundary(self):
+        """沿著 next 依序走過 cell 的邊界半邊"""
+        start = self.half_edge
+        he = start
+        while he is not None:
+            yield he
+            he = he.next
+            if he is start:
+                break
+
+    def neighbors(self):
+        """相鄰的 site（每一條邊界半邊的 twin 所在的 cell）"""
+        return [he.twin.face.site for he in self.boundary()]
+
+
+# 凸包資料結構
+class ConvexHull:
+    """有序凸包
+
+    points 依外積 > 0 的方向排列（數學座標的逆時針；畫面座標 y 向下，看起來是順時針），
+    points[0] 是 (x, y) 字典序最小的點，right_index 指向字典序最大的點。
+    遞迴的每一層都帶著自己的凸包往上傳，merge 時以上下兩條切線在 O(h) 內縫合。
+    """
+    def __init__(self, points=None, right_index=0):
+        self.points = points if points is not None else []
+        self.right_index = right_index
+
+    def __len__(self):
+        return len(self.points)
+
+    def __iter__(self):
+        return iter(self.points)
+
+    @property
+    def leftmost(self):
+        return self.points[0]
+
+    @property
+    def rightmost(self):
+        return self.points[self.right_index]
+
+    @staticmethod
+    def cross(o, a, b):
+        """計算向量(o->a) × (o->b)的外積（符號精確，0 表示真的共線）"""
+        return orient2d(o, a, b)
+
+    @classmethod
+    def from_points(cls, points):
+        """以 Andrew monotone chain 建立凸包（只用在遞迴底層的少量點）"""
+        pts = sorted(set(points), key=lambda p: (p.x, p.y))
+        if len(pts) <= 2:
+            return cls(pts, max(len(pts) - 1, 0))
+
+        lower = []
+        for p in pts:
+            while len(lower) >= 2 and cls.cross(lower[-2], lower[-1], p) <= 0:
+                lower.pop()
+            lower.append(p)
+        upper = []
+        for p in reversed(pts):
+            while len(upper) >= 2 and cls.cross(upper[-2], upper[-1], p) <= 0:
+                upper.pop()
+            upper.append(p)
+
+        # 全部共線時只剩兩個端點
+        if len(lower) == 2 and len(upper) == 2:
+            return cls([lower[0], lower[1]], 1)
+        return cls(lower[:-1] + upper[:-1], len(lower) - 1)
+
+    def _walk(self, start, end):
+        """沿著凸包順序從 start 走到 end（含兩端）"""
+        n = len(self.points)
+        result = [self.points[start]]
+        i = start
+        while i != end:
+            i = (i + 1) % n
+            result.append(self.points[i])
+        return result
+
+    @staticmethod
+    def find_tangents(left, right):
+        """找出左右凸包的上切線與下切線
+
+        左凸包的點在 (x, y) 字典序上全部小於右凸包。
+        回傳 ((上切線左索引, 上切線右索引), (下切線左索引, 下切線右索引))，
+        「上」指畫面上方（y 較小）。切線上有共線點時停在最靠近另一側的點。
+        """
+        nl, nr = len(left.points), len(right.points)
+        L, R = left.points, right.points
+        cross = ConvexHull.cross
+
+        # 上切線：其他點都要在 a->b 的左側（外積 >= 0）
+        a, b = left.right_index, 0
+        moved = True
+        while moved:
+            moved = False
+            while nl > 1 and cross(L[a], R[b], L[(a - 1) % nl]) < 0:
+                a = (a - 1) % nl
+                moved = True
+            while nr > 1 and cross(L[a], R[b], R[(b + 1) % nr]) < 0:
+                b = (b + 1) % nr
+                moved = True
+        upper = (a, b)
+
+        # 下切線：其他點都要在 a->b 的右側（外積 <= 0）
+        a, b = left.right_index, 0
+        moved = True
+        while moved:
+            moved = False
+            while nl > 1 and cross(L[a], R[b], L[(a + 1) % nl]) > 0:
+                a = (a + 1) % nl
+                moved = True
+            while nr > 1 and cross(L[a], R[b], R[(b - 1) % nr]) > 0:
+                b = (b - 1) % nr
+                moved = True
+        lower = (a, b)
+
+        return upper, lower
+
+    @classmethod
+    def merge(cls, left, right, tangents=None):
+        """以上下切線縫合左右凸包，回傳合併後的 ConvexHull（O(h)）"""
+        if not left.points:
+            return right
+        if not right.points:
+            return left
+        if tangents is None:
+            tangents = cls.find_tangents(left, right)
+        (upper_a, upper_b), (lower_a, lower_b) = tangents
+
+        # 兩條切線碰到同一點但該側不只一點：只會在共線退化時發生，直接重建
+        if (upper_a == lower_a and len(left.points) > 1) or (upper_b == lower_b and len(right.points) > 1):
+            return cls.from_points(left.points + right.points)
+
+        # 依外積 > 0 的方向：左側從下切線走到上切線，右側從上切線走到下切線
+        left_part = left._walk(lower_a, upper_a)
+        right_part = right._walk(upper_b, lower_b)
+
+        # 旋轉成從最左點開始
+        shift = (len(left.points) - lower_a) % len(left.points)
+        points = left_part[shift:] + right_part + left_part[:shift]
+        # 切線停在最靠近另一側的點，切線上有共線點時接縫處會留下共線的點，
+        # 與 from_points 一樣拿掉（只可能在接縫，最左、最右點不會被拿掉）
+        n = len(points)
+        if n > 2:
+            points = [p for i, p in enumerate(points) if cls.cross(points[i - 1], p, points[(i + 1) % n]) != 0]
+        return cls(points, points.index(right.rightmost))
+
+
 # 主資料結構
 class VoronoiDiagram:
     def __init__(self):
@@ -260,20 +536,371 @@ class VoronoiDiagram:
         self.edges = []           # 中垂線的列表
         self.vertices = []        # Voronoi vertices 的列表
         self.point_to_edges = {}  # 點到中垂線的映射
+        self.hull = ConvexHull()  # 點集的凸包（由引擎在遞迴中維護）
+        self.faces = {}           # 點到 Face 的映射（build_half_edges 之後才有）
+        self.triangulation = None # 對偶的 DelaunayTriangulation（由 Delaunay 引擎建立時才有）
+        self.dual_edges = {}      # Delaunay 邊 (a, b) -> 對偶的 VoronoiEdge（有 triangulation 時才有）
+        self.dual_vertices = {}   # Delaunay 三角形 -> 對偶的 VoronoiVertex（共圓的三角形共用一個）
+        # edges / vertices 中每個物件的位置，讓 remove_edge / remove_vertex 不必線性搜尋
+        self._point_slot = {}
+        self._edge_slot = {}
+        self._vertex_slot = {}
 
     def add_point(self, point):
+        self._point_slot[point] = len(self.points)
         self.points.append(point)
         self.point_to_edges[point] = []
 
     def add_edge(self, edge):
+        self._edge_slot[edge] = len(self.edges)
         self.edges.append(edge)
         # 更新點到中垂線的映射
         self.point_to_edges[edge.site1].append(edge)
         self.point_to_edges[edge.site2].append(edge)
 
     def add_vertex(self, vertex):
+        self._vertex_slot[vertex] = len(self.vertices)
         self.vertices.append(vertex)
 
+    @staticmethod
+    def _swap_remove(items, slots, item):
+        """把 item 與最後一個元素交換後移除，O(1)；slots 過期時（列表被直接改寫過）退回線性搜尋"""
+        i = slots.pop(item, None)
+        if i is None or i >= len(items) or items[i] != item:
+            if item not in items:
+                return
+            i = items.index(item)
+        last = items.pop()
+        if i < len(items):
+            items[i] = last
+            slots[last] = i
+
+    def remove_edge(self, edge):
+        """移除一條邊：同時從兩個 site 的映射、端點 vertex 與半邊結構中拿掉"""
+        self._swap_remove(self.edges, self._edge_slot, edge)
+        for site in (edge.site1, edge.site2):
+            site_edges = self.point_to_edges.get(site)
+            if site_edges and edge in site_edges:
+                site_edges.remove(edge)
+        for vertex in (edge.start_vertex, edge.end_vertex):
+            if vertex is not None:
+                vertex.remove_edge(edge)
+        if edge.half_edge is not None:
+            for he in (edge.half_edge, edge.half_edge.twin):
+                if he.face.half_edge is he:
+                    he.face.half_edge = None
+            edge.half_edge = None
+
+    def remove_vertex(self, vertex):
+        self._swap_remove(self.vertices, self._vertex_slot, vertex)
+
+    def has_vertex(self, vertex):
+        return vertex in self._vertex_slot
+
+    def clear(self):
+        """清空所有點、邊與附帶的結構"""
+        self.__init__()
+
+    @property
+    def half_edges(self):
+        """所有半邊（每條邊的一對 twin）"""
+        result = []
+        for edge in self.edges:
+            if edge.half_edge is not None:
+                result.append(edge.half_edge)
+                result.append(edge.half_edge.twin)
+        return result
+
+    def insert_site(self, point):
+        """增量插入一個 site，只更新新 cell 附近的邊與頂點
+
+        第一次呼叫時以目前的點建立 Delaunay triangulation（之後一直沿用），
+        每次插入只改動外接圓包含新點的那些三角形（期望 O(1) 個），
+        再把這些三角形對偶的邊與頂點換掉，並重接受影響的 cell 的半邊。
+        點定位用 jump-and-walk（見 DelaunayTriangulation.jump_start），
+        整體期望為點定位加上 O(新 cell 的邊數)。
+        回傳是否真的插入（重複的點回傳 False）。
+        """
+        from delaunay import DelaunayTriangulation, update_voronoi
+
+        if not isinstance(point, Point):
+            point = Point(*point)
+        if point in self.point_to_edges:
+            return False
+
+        dt = self.triangulation
+        if dt is None:
+            self._replace_with(DelaunayTriangulation(self.points + [point]).to_voronoi())
+            return True
+
+        removed, added = dt.insert(point, jump=True)
+        self.add_point(point)
+        if not removed:
+            # 還在全部共線的階段，或剛湊出第一個三角形：直接重新取對偶
+            self._replace_with(dt.to_voronoi())
+            return True
+
+        affected = update_voronoi(self, removed, added)
+        self.relink_faces(affected)
+        return True
+
+    def remove_site(self, point):
+        """刪除一個 site，只重建它的 cell 留下的洞
+
+        在 triangulation 上刪掉這個點（見 DelaunayTriangulation.remove），
+        洞裡的新三角形只由原本相鄰的 site 組成，換掉對偶的邊與頂點並重接相鄰 cell 的半邊，
+        期望 O(d log d)，d 是被刪 cell 的邊數。回傳是否真的刪除。
+        """
+        from delaunay import DelaunayTriangulation, update_voronoi
+
+        if not isinstance(point, Point):
+            point = Point(*point)
+        if point not in self.point_to_edges:
+            return False
+
+        dt = self.triangulation
+        if dt is None:
+            rest = [p for p in self.points if p != point]
+            self._replace_with(DelaunayTriangulation(rest).to_voronoi())
+            return True
+
+        removed, added = dt.remove(point)
+        if not removed:
+            # 刪到只剩共線的點（或還沒有三角形）：直接重新取對偶
+            self._replace_with(dt.to_voronoi())
+            return True
+
+        affected = update_voronoi(self, removed, added)
+        self._swap_remove(self.points, self._point_slot, point)
+        del self.point_to_edges[point]
+        self.faces.pop(point, None)
+        affected.discard(point)
+        self.relink_faces(affected)
+        return True
+
+    def move_sites(self, moves):
+        """kinetic 更新：把既有的 site 移到新位置，只修補拓撲有變化的地方
+
+        moves 是 {舊位置: 新位置} 或 (舊位置, 新位置) 的序列。
+        移動後 star 仍然合法的 site 直接在 triangulation 上改座標，
+        再從這些三角形做 Lawson flip 修回 Delaunay，只重算被移動的 site 周圍的頂點與邊，
+        其他 cell 的幾何完全不動，成本與移動量（flip 次數）成正比。
+        移動太大（star 會翻轉）或在凸包上的 site 退回 remove_site + insert_site。
+        回傳受影響的 site。新位置與沒有移動的 site 重疊，或兩個 site 移到同一個位置時 raise ValueError。
+        """
+        from delaunay import DelaunayTriangulation, attach_dual, detach_dual
+
+        if isinstance(moves, dict):
+            moves = moves.items()
+        moves = [(p if isinstance(p, Point) else Point(*p), q if isinstance(q, Point) else Point(*q))
+                 for p, q in moves]
+        # 先檢查再動手：互換、輪換可以，但不能蓋到不動的 site，也不能兩個移到同一點
+        sources = {p for p, q in moves if p != q and p in self.point_to_edges}
+        targets = set()
+        for p, q in moves:
+            if p == q or p not in self.point_to_edges:
+                continue
+            if q in targets or (q in self.point_to_edges and q not in sources):
+                raise ValueError(f"site 不能移到已經有 site 的位置: ({q.x}, {q.y})")
+            targets.add(q)
+        dt = self.triangulation
+        if dt is None or not dt.triangles:
+            # 還沒有 triangulation（或全部共線）時沒有可以沿用的結構，直接重建
+            moved = dict(moves)
+            self._replace_with(DelaunayTriangulation([moved.get(p, p) for p in self.points]).to_voronoi())
+            return set(self.points)
+
+        affected = set()
+        dirty = []
+        fallback = []
+        for p, q in moves:
+            if p == q or p not in self.point_to_edges:
+                continue
+            star = dt.movable_star(p, q)
+            if star is None:
+                fallback.append((p, q))
+                continue
+            detach_dual(self, star, affected)
+            dt.move(star, p, q)
+            # 換掉 site 物件：cell 的邊已經全部拿掉，之後由 attach_dual 重新接上
+            i = self._point_slot.pop(p, None)
+            if i is None or self.points[i] != p:
+                i = self.points.index(p)
+            self.points[i] = q
+            self._point_slot[q] = i
+            del self.point_to_edges[p]
+            self.point_to_edges[q] = []
+            self.faces.pop(p, None)
+            affected.discard(p)
+            dirty.extend(star)
+
+        removed, added = dt.flip_to_delaunay(dirty)
+        detach_dual(self, removed, affected)
+        attach_dual(self, [t for t in dirty if t.alive] + added, affected)
+        self.relink_faces(affected)
+
+        # 先刪掉所有舊位置再插入新位置：互換或輪換時新位置可能還被另一個要移動的 site 佔著
+        for p, q in fallback:
+            self.remove_site(p)
+            affected.discard(p)
+        for p, q in fallback:
+            self.insert_site(q)
+            affected.add(q)
+        return affected
+
+    def _replace_with(self, other):
+        """以另一個 VoronoiDiagram 的內容取代自己（保留物件本身，讓外部的參照仍然有效）"""
+        self.__dict__.update(other.__dict__)
+        self.build_half_edges()
+
+    def to_compact(self):
+        """轉成只含 tuple / list / 數字的精簡形式，可以 pickle 後在行程之間傳遞
+
+        物件之間的參照都改成索引：site 為 points 的索引，端點為 vertex 表的索引，
+        保留 merge 會用到的邊狀態（life、is_hyperplane 等）；半邊結構不保留，需要時再重建。
+        """
+        point_index = {}
+        for i, point in enumerate(self.points):
+            point_index.setdefault(id(point), i)
+            point_index.setdefault(point, i)
+
+        def site(point):
+            i = point_index.get(id(point))
+            return i if i is not None else point_index[point]
+
+        # vertices 列表之外、只被邊當作端點的 vertex（射線的遠端）也放進 vertex 表
+        vertex_index = {}
+        vertex_table = []
+        vertex_objects = []
+
+        def vertex(v):
+            if v is None:
+                return -1
+            i = vertex_index.get(id(v))
+            if i is None:
+                i = vertex_index[id(v)] = len(vertex_table)
+                sites = tuple(site(s) for s in v.sites) if v.sites else None
+                vertex_table.append((v.x, v.y, sites))
+                vertex_objects.append(v)
+            return i
+
+        vertex_list = [vertex(v) for v in self.vertices]
+        edge_index = {}
+        edge_table = []
+
+        def edge(e):
+            i = edge_index.get(id(e))
+            if i is None:
+                i = edge_index[id(e)] = len(edge_table)
+                edge_table.append((site(e.site1), site(e.site2), vertex(e.start_vertex), vertex(e.end_vertex),
+                                   e.life, e.is_hyperplane, e.is_infinite,
+                                   e.get_debug('is_original_bisector', False)))
+            return i
+
+        edge_list = [edge(e) for e in self.edges]
+        point_to_edges = [(site(p), [edge(e) for e in edges]) for p, edges in self.point_to_edges.items()]
+        # 每個 vertex 相接的邊照原本的順序保存（edge() 可能再加入新的 vertex，所以跑到表的結尾為止）
+        vertex_edges = []
+        while len(vertex_edges) < len(vertex_objects):
+            vertex_edges.append([edge(e) for e in vertex_objects[len(vertex_edges)].edges])
+        hull = ([site(p) for p in self.hull.points], self.hull.right_index)
+        return ([(p.x, p.y) for p in self.points], vertex_table, vertex_edges, vertex_list,
+                edge_table, edge_list, point_to_edges, hull)
+
+    @classmethod
+    def from_compact(cls, data, points=None):
+        """由 to_compact 的結果還原；points 給定時直接使用這些 Point 物件（須與原本的順序相同）"""
+        coords, vertex_table, vertex_edges, vertex_list, edge_table, edge_list, point_to_edges, hull = data
+        vd = cls()
+        if points is None:
+            points = [Point(x, y) for x, y in coords]
+        vd.points = list(points)
+        vertices = [VoronoiVertex(x, y, sites=tuple(points[i] for i in sites) if sites else None)
+                    for x, y, sites in vertex_table]
+        edges = []
+        for s1, s2, start, end, life, is_hyperplane, is_infinite, is_original_bisector in edge_table:
+            e = VoronoiEdge(points[s1], points[s2], is_hyperplane=is_hyperplane)
+            e.start_vertex = vertices[start] if start >= 0 else None
+            e.end_vertex = vertices[end] if end >= 0 else None
+            e.life = life
+            e.is_infinite = is_infinite
+            if is_original_bisector:
+                e.set_debug('is_original_bisector', True)
+            edges.append(e)
+        for v, indices in zip(vertices, vertex_edges):
+            v.edges = [edges[j] for j in indices]
+        vd.vertices = [vertices[i] for i in vertex_list]
+        vd.edges = [edges[i] for i in edge_list]
+        vd.point_to_edges = {points[i]: [edges[j] for j in indices] for i, indices in point_to_edges}
+        vd.hull = ConvexHull([points[i] for i in hull[0]], hull[1])
+        vd._point_slot = {p: i for i, p in enumerate(vd.points)}
+        vd._edge_slot = {e: i for i, e in enumerate(vd.edges)}
+        vd._vertex_slot = {v: i for i, v in enumerate(vd.vertices)}
+        return vd
+
+    def build_half_edges(self):
+        """由 edges 建立半邊結構：每條邊一對 twin，每個 site 一個 Face
+
+        每個 cell 的半邊依繞 site 的角度排序後串起 next / prev，
+        相鄰兩條半邊不共用同一個 vertex（無界 cell 的射線處）時不串接。
+        """
+        self.faces = {}
+        for edge in self.edges:
+            edge.half_edge = None
+        self.relink_faces(self.points)
+
+    def _make_half_edge_pair(self, edge):
+        face1 = self.faces.setdefault(edge.site1, Face(edge.site1))
+        face2 = self.faces.setdefault(edge.site2, Face(edge.site2))
+        start, end = edge.start_vertex, edge.end_vertex
+        # site1 在 start -> end 左側時，site1 的半邊從 start 出發，否則反向
+        if ConvexHull.cross(start, end, edge.site1) > 0:
+            he1 = HalfEdge(edge, start, face1)
+            he2 = HalfEdge(edge, end, face2)
+        else:
+            he1 = HalfEdge(edge, end, face1)
+            he2 = HalfEdge(edge, start, face2)
+        he1.twin = he2
+        he2.twin = he1
+        edge.half_edge = he1
+
+    def relink_faces(self, sites):
+        """重新串接指定 site 的 cell 邊界；還沒有半邊的邊會先補上一對 twin
+
+        只碰這些 site 的邊，增量插入後只需要對受影響的 cell 呼叫。
+        """
+        for site in sites:
+            face = self.faces.setdefault(site, Face(site))
+            hes = []
+            for edge in self.point_to_edges.get(site, []):
+                if edge.start_vertex is None or edge.end_vertex is None:
+                    continue
+                if edge.half_edge is None:
+                    self._make_half_edge_pair(edge)
+                he = edge.half_edge if edge.half_edge.face is face else edge.half_edge.twin
+                he.next = None
+                he.prev = None
+                hes.append(he)
+            face.half_edge = None
+            if not hes:
+                continue
+            # 以半邊中點相對於 site 的角度排序，就是繞 cell 邊界的順序
+            hes.sort(key=lambda he: math.atan2((he.origin.y + he.destination.y) / 2 - site.y,
+                                               (he.origin.x + he.destination.x) / 2 - site.x))
+            count = len(hes)
+            for i in range(count):
+                he = hes[i]
+                nxt = hes[(i + 1) % count]
+                if count > 1 and he.destination is nxt.origin:
+                    he.next = nxt
+                    nxt.prev = he
+            # 無界 cell 的 half_edge 指向沒有 prev 的那一條，讓 boundary() 能走完整條鏈
+            face.half_edge = hes[0]
+            for he in hes:
+                if he.prev is None:
+                    face.half_edge = he
+                    break
+
     def extend(self,points):
         pass
     
@@ -290,8 +917,138 @@ class VoronoiDiagram:
         
         # 保留較近的端點，用 cut_point 替換較遠的端點
         if dist_to_start > dist_to_end:
-            edge.start_vertex = VoronoiVertex(cut_point.x, cut_point.y)
+            edge.set_start_vertex(VoronoiVertex(cut_point.x, cut_point.y))
+        else:
+            edge.set_end_vertex(VoronoiVertex(cut_point.x, cut_point.y))
+
+
+class VoronoiArrays:
+    """以陣列保存的 Voronoi Diagram（struct-of-arrays）
+
+    site、vertex、edge 都用整數 id 表示，座標與參照各自存成 array 模組的型別陣列：
+    site_x / site_y、vertex_x / vertex_y、vertex_sites（每個 vertex 三個 site id）、
+    edge_site1 / edge_site2、edge_start / edge_end（-1 表示沒有端點）。
+    不需要每個物件各自的 Python 物件，記憶體只有物件版本的一小部分，
+    可以直接交給 NumPy（np.frombuffer）或 pickle 給其他行程。
+    需要原本物件介面的地方（GUI、逐點插入）用 to_diagram() 轉回 VoronoiDiagram。
+    """
+    def __init__(self, n_sites=0):
+        # 依 Euler 公式預先配置：n 個 site 最多 2n-5 個 Voronoi vertex、3n-6 條邊，
+        # 射線遠端的端點每個凸包點最多一個（全部共線時每條邊兩個，也不超過 3n-5）
+        vertex_capacity = max(3 * n_sites - 5, 2)
+        edge_capacity = max(3 * n_sites - 6, n_sites - 1, 1)
+        self.site_x = array('d', bytes(8 * n_sites))
+        self.site_y = array('d', bytes(8 * n_sites))
+        self.vertex_x = array('d', bytes(8 * vertex_capacity))
+        self.vertex_y = array('d', bytes(8 * vertex_capacity))
+        self.vertex_sites = array('i', bytes(4 * 3 * vertex_capacity))
+        self.edge_site1 = array('i', bytes(4 * edge_capacity))
+        self.edge_site2 = array('i', bytes(4 * edge_capacity))
+        self.edge_start = array('i', bytes(4 * edge_capacity))
+        self.edge_end = array('i', bytes(4 * edge_capacity))
+        self.hull = array('i')   # 凸包上的 site id，順序與 ConvexHull.points 相同
+        self.hull_right_index = 0
+        self.n_sites = 0
+        self.n_vertices = 0
+        self.n_edges = 0
+
+    @staticmethod
+    def _put(arr, i, value):
+        if i < len(arr):
+            arr[i] = value
         else:
-            edge.end_vertex = VoronoiVertex(cut_point.x, cut_point.y)
+            arr.append(value)
+
+    def add_site(self, x, y):
+        i = self.n_sites
+        self._put(self.site_x, i, x)
+        self._put(self.site_y, i, y)
+        self.n_sites += 1
+        return i
+
+    def add_vertex(self, x, y, sites=None):
+        """sites 為三個 site id（射線遠端等沒有 site 的點給 None）"""
+        i = self.n_vertices
+        self._put(self.vertex_x, i, x)
+        self._put(self.vertex_y, i, y)
+        for k, site in enumerate(sites if sites else (-1, -1, -1)):
+            self._put(self.vertex_sites, 3 * i + k, site)
+        self.n_vertices += 1
+        return i
+
+    def add_edge(self, site1, site2, start=-1, end=-1):
+        i = self.n_edges
+        self._put(self.edge_site1, i, site1)
+        self._put(self.edge_site2, i, site2)
+        self._put(self.edge_start, i, start)
+        self._put(self.edge_end, i, end)
+        self.n_edges += 1
+        return i
+
+    def trim(self):
+        """把預先配置但沒用到的空間截掉，之後每個陣列的長度就是實際數量"""
+        for arr, n in ((self.site_x, self.n_sites), (self.site_y, self.n_sites),
+                       (self.vertex_x, self.n_vertices), (self.vertex_y, self.n_vertices),
+                       (self.vertex_sites, 3 * self.n_vertices),
+                       (self.edge_site1, self.n_edges), (self.edge_site2, self.n_edges),
+                       (self.edge_start, self.n_edges), (self.edge_end, self.n_edges)):
+            del arr[n:]
+        return self
+
+    @property
+    def nbytes(self):
+        return sum(arr.itemsize * len(arr) for arr in (
+            self.site_x, self.site_y, self.vertex_x, self.vertex_y, self.vertex_sites,
+            self.edge_site1, self.edge_site2, self.edge_start, self.edge_end, self.hull))
+
+    @classmethod
+    def from_diagram(cls, vd):
+        """由物件版本的 VoronoiDiagram 轉換（site 依 vd.points 的順序編號）"""
+        arrays = cls(len(vd.points))
+        site_ids = {}
+        for point in vd.points:
+            # 重複的點共用同一個 site，不另外產生沒有邊參照的 site
+            if point not in site_ids:
+                site_ids[point] = arrays.add_site(point.x, point.y)
+        vertex_ids = {}
+
+        def vertex_id(vertex):
+            if vertex is None:
+                return -1
+            i = vertex_ids.get(id(vertex))
+            if i is None:
+                sites = tuple(site_ids[s] for s in vertex.sites) if vertex.sites else None
+                i = vertex_ids[id(vertex)] = arrays.add_vertex(vertex.x, vertex.y, sites)
+            return i
 
+        for vertex in vd.vertices:
+            vertex_id(vertex)
+        for edge in vd.edges:
+            arrays.add_edge(site_ids[edge.site1], site_ids[edge.site2],
+                            vertex_id(edge.start_vertex), vertex_id(edge.end_vertex))
+        arrays.hull = array('i', (site_ids[p] for p in vd.hull.points))
+        arrays.hull_right_index = vd.hull.right_index
+        return arrays.trim()
 
+    def to_diagram(self):
+        """轉回物件版本的 VoronoiDiagram，提供 GUI 等使用原本介面的程式"""
+        vd = VoronoiDiagram()
+        points = [Point(self.site_x[i], self.site_y[i]) for i in range(self.n_sites)]
+        for point in points:
+            vd.add_point(point)
+        vertices = []
+        for i in range(self.n_vertices):
+            sites = self.vertex_sites[3 * i:3 * i + 3]
+            vertex = VoronoiVertex(self.vertex_x[i], self.vertex_y[i],
+                                   sites=tuple(points[s] for s in sites) if sites[0] >= 0 else None)
+            vertices.append(vertex)
+            vd.add_vertex(vertex)
+        for i in range(self.n_edges):
+            edge = VoronoiEdge(points[self.edge_site1[i]], points[self.edge_site2[i]])
+            if self.edge_start[i] >= 0:
+                edge.set_start_vertex(vertices[self.edge_start[i]])
+            if self.edge_end[i] >= 0:
+                edge.set_end_vertex(vertices[self.edge_end[i]])
+            vd.add_edge(edge)
+        vd.hull = ConvexHull([points[i] for i in self.hull], self.hull_right_index)
+        return vd
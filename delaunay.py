@@ -0,0 +1,779 @@
+#演算法部分：Delaunay triangulation（randomized incremental / Bowyer-Watson），再取對偶得到 Voronoi Diagram
+#凸包外側用「無限遠點」的 ghost 三角形表示，不需要超大外框三角形，也沒有外框造成的邊界誤差
+from datastructer import *
+from predicates import orient2d, incircle
+from array import array
+import heapq
+import random
+
+
+def hilbert_index(x, y, order):
+    """(x, y) 在 2^order × 2^order 格子上的 Hilbert 曲線序號"""
+    d = 0
+    s = 1 << (order - 1)
+    while s > 0:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        d += s * s * ((3 * rx) ^ ry)
+        if ry == 0:
+            if rx == 1:
+                x = s - 1 - x
+                y = s - 1 - y
+            x, y = y, x
+        s >>= 1
+    return d
+
+
+class Triangle:
+    """Delaunay 三角形
+
+    v 依外積 > 0 的方向排列；n[i] 是 v[i] 對面那條邊的相鄰三角形。
+    ghost 三角形的 v[2] 為 None（無限遠點），v[0] -> v[1] 是凸包邊，外側在左邊。
+    """
+    def __init__(self, a, b, c):
+        self.v = [a, b, c]
+        self.n = [None, None, None]
+        self.alive = True
+
+    @property
+    def is_ghost(self):
+        return self.v[2] is None
+
+    def neighbor_index(self, tri):
+        for i in range(3):
+            if self.n[i] is tri:
+                return i
+        return -1
+
+    def circumcenter(self):
+        a, b, c = self.v
+        # orient2d 在接近共線時回傳精確的 Fraction，外心座標仍用 float
+        d = 2 * float(orient2d(a, b, c))
+        bx, by = b.x - a.x, b.y - a.y
+        cx, cy = c.x - a.x, c.y - a.y
+        b2 = bx * bx + by * by
+        c2 = cx * cx + cy * cy
+        return a.x + (cy * b2 - by * c2) / d, a.y + (bx * c2 - cx * b2) / d
+
+    def __repr__(self):
+        return f"Triangle({self.v[0]}, {self.v[1]}, {self.v[2]})"
+
+
+class DelaunayTriangulation:
+    """以三角形鄰接關係維護的 Delaunay triangulation
+
+    insert() 先沿著鄰接關係走到包含新點的三角形，再把外接圓包含新點的區域（cavity）
+    挖掉、以新點重新連成扇形，期望每次 O(1) 個三角形被改動。
+    """
+
+    def __init__(self, points=None, seed=0):
+        self.rng = random.Random(seed)
+        self.triangles = {}         # 所有存活的三角形（含 ghost），以 dict 當作有序集合讓輸出順序固定
+        self.vertex_triangle = {}   # site -> 任一個包含它的三角形
+        self.pending = []           # 還湊不出非共線三角形前的點（全部共線）
+        self.last = None            # 上一次走訪到的三角形，作為下一次點定位的起點
+        self.site_list = []         # 依插入順序的 site，jump-and-walk 從中抽樣起點
+        if points:
+            for p in self.insertion_order(points):
+                self.insert(p)
+
+    def insertion_order(self, points):
+        """BRIO 插入順序：隨機分成大小倍增的幾輪，每一輪內依 Hilbert 曲線排序
+
+        保有隨機插入的期望複雜度，同時讓相鄰兩次插入在空間上靠近，點定位的走訪很短。
+        """
+        points = [p if isinstance(p, Point) else Point(*p) for p in points]
+        self.rng.shuffle(points)
+        if len(points) < 64:
+            return points
+        min_x = min(p.x for p in points)
+        min_y = min(p.y for p in points)
+        span = max(max(p.x for p in points) - min_x, max(p.y for p in points) - min_y) or 1
+        scale = ((1 << 16) - 1) / span
+
+        def key(p):
+            return hilbert_index(int((p.x - min_x) * scale), int((p.y - min_y) * scale), 16)
+
+        rounds = []
+        end = len(points)
+        while end > 32:
+            start = end // 2
+            rounds.append(sorted(points[start:end], key=key))
+            end = start
+        rounds.append(points[:end])
+        order = []
+        for r in reversed(rounds):
+            order.extend(r)
+        return order
+
+    # ---- 查詢 ----
+
+    @property
+    def sites(self):
+        if not self.triangles:
+            return list(self.pending)
+        return list(self.vertex_triangle)
+
+    def solid_triangles(self):
+        return [t for t in self.triangles if not t.is_ghost]
+
+    def edges(self):
+        """所有 Delaunay 邊 (a, b)，每條邊回傳一次"""
+        if not self.triangles:
+            pending = sorted(self.pending, key=lambda p: (p.x, p.y))
+            return list(zip(pending, pending[1:]))
+        result = []
+        for t in self.triangles:
+            for i in range(3):
+                a, b = t.v[(i + 1) % 3], t.v[(i + 2) % 3]
+                if a is None or b is None:
+                    continue
+                # 每條邊在兩側三角形各出現一次，只在 (x, y) 較小的一端取
+                if (a.x, a.y) < (b.x, b.y):
+                    result.append((a, b))
+        return result
+
+    def conflicts(self, t, p):
+        """p 是否落在三角形 t 的外接圓內（ghost 則為凸包邊外側的半平面）"""
+        a, b, c = t.v
+        if c is None:
+            o = orient2d(a, b, p)
+            if o != 0:
+                return o > 0
+            # 與凸包邊共線：落在邊的內部時要把這條凸包邊拆開
+            return (p.x - a.x) * (p.x - b.x) + (p.y - a.y) * (p.y - b.y) < 0
+        return incircle(a, b, c, p) > 0
+
+    def jump_start(self, p):
+        """jump-and-walk：隨機抽 n^(1/3) 個 site，從離 p 最近的那個開始走，期望走訪 O(n^(1/3)) 個三角形
+
+        建構時插入順序已經依 Hilbert 曲線排好，直接從上一次的位置走就很近；
+        畫布上一次一個、位置任意的插入才需要先跳到附近。
+        """
+        count = int(len(self.site_list) ** (1 / 3)) + 1
+        best = None
+        best_dist = None
+        for _ in range(count):
+            site = self.site_list[self.rng.randrange(len(self.site_list))]
+            t = self.vertex_triangle.get(site)
+            if t is None:
+                continue
+            dist = (site.x - p.x) ** 2 + (site.y - p.y) ** 2
+            if best is None or dist < best_dist:
+                best, best_dist = t, dist
+        return best
+
+    def locate(self, p, jump=False):
+        """從上一次的位置沿著鄰接關係走到包含 p 的三角形（p 在凸包外時回傳對應的 ghost）
+
+        jump 為 True 時改從 jump_start() 抽樣到的位置開始走。
+        """
+        t = self.jump_start(p) if jump else None
+        if t is None:
+            t = self.last if self.last is not None and self.last.alive else next(iter(self.triangles))
+        if t.is_ghost:
+            t = t.n[2]
+        while True:
+            if t.is_ghost:
+                if self.conflicts(t, p):
+                    return t
+                t = t.n[2]
+                continue
+            start = self.rng.randrange(3)
+            for k in range(3):
+                i = (start + k) % 3
+                if orient2d(t.v[(i + 1) % 3], t.v[(i + 2) % 3], p) < 0:
+                    t = t.n[i]
+                    break
+            else:
+                return t
+
+    def star(self, p):
+        """繞 p 一圈的所有三角形（含 ghost），依外積 > 0 的方向排列"""
+        star = []
+        t = self.vertex_triangle[p]
+        while True:
+            star.append(t)
+            # 三角形 (p, u, w) 的下一個是跨過 w-p 的 (p, w, x)
+            t = t.n[(t.v.index(p) + 1) % 3]
+            if t is star[0]:
+                return star
+
+    # ---- 修改 ----
+
+    def insert(self, p, jump=False):
+        """插入一個點，回傳 (被移除的三角形, 新增的三角形)；重複的點不做任何事
+
+        jump 見 locate()。
+        """
+        p = p if isinstance(p, Point) else Point(*p)
+        if not self.triangles:
+            return self._insert_pending(p)
+        if p in self.vertex_triangle:
+            return [], []
+
+        seed = self.locate(p, jump)
+        # 沿著鄰接關係找出整個 cavity
+        cavity = [seed]
+        in_cavity = {seed}
+        boundary = []
+        k = 0
+        while k < len(cavity):
+            t = cavity[k]
+            k += 1
+            for i in range(3):
+                nb = t.n[i]
+                if nb in in_cavity:
+                    continue
+                if self.conflicts(nb, p):
+                    in_cavity.add(nb)
+                    cavity.append(nb)
+                else:
+                    boundary.append((t.v[(i + 1) % 3], t.v[(i + 2) % 3], nb))
+        new_triangles = self._fill_cavity(cavity, boundary, p)
+        return cavity, new_triangles
+
+    def _fill_cavity(self, cavity, boundary, p):
+        """把 cavity 移除，每條邊界邊 (u, w) 與 p 連成新三角形"""
+        for t in cavity:
+            t.alive = False
+            self.triangles.pop(t, None)
+
+        by_first = {}
+        by_second = {}
+        new_triangles = []
+        for u, w, outside in boundary:
+            t = Triangle(u, w, p)
+            t.n[2] = outside
+            # 外側三角形原本指向 cavity 的那個鄰居改成指向新三角形
+            for i in range(3):
+                if outside.v[(i + 1) % 3] is w and outside.v[(i + 2) % 3] is u:
+                    outside.n[i] = t
+                    break
+            by_first[u] = t
+            by_second[w] = t
+            new_triangles.append(t)
+
+        for t in new_triangles:
+            u, w = t.v[0], t.v[1]
+            t.n[0] = by_first[w]   # 邊 w -> p 的另一側
+            t.n[1] = by_second[u]  # 邊 p -> u 的另一側
+
+        for t in new_triangles:
+            # ghost 三角形統一把無限遠點放在 v[2]
+            while t.v[2] is not None and None in t.v:
+                t.v = t.v[1:] + t.v[:1]
+                t.n = t.n[1:] + t.n[:1]
+            self.triangles[t] = None
+            for site in t.v:
+                if site is not None:
+                    self.vertex_triangle[site] = t
+        self.site_list.append(p)
+        self.last = new_triangles[0]
+        return new_triangles
+
+    def _insert_pending(self, p):
+        """尚未有三角形時先收集點，直到出現不共線的三點才建立第一個三角形"""
+        if p in self.pending:
+            return [], []
+        self.pending.append(p)
+        if len(self.pending) < 3:
+            return [], []
+        a, b = self.pending[0], self.pending[1]
+        c = None
+        for q in self.pending[2:]:
+            if orient2d(a, b, q) != 0:
+                c = q
+                break
+        if c is None:
+            return [], []
+
+        if orient2d(a, b, c) < 0:
+            a, b = b, a
+        t = Triangle(a, b, c)
+        ghosts = [Triangle(b, a, None), Triangle(c, b, None), Triangle(a, c, None)]
+        # t 的三條邊：v[2] 對面是 a->b，v[0] 對面是 b->c，v[1] 對面是 c->a
+        t.n = [ghosts[1], ghosts[2], ghosts[0]]
+        for g in ghosts:
+            g.n[2] = t
+        # ghost 之間沿著凸包相鄰：ghost(x->y) 的 v[0] 對面是 y->∞，接到下一條凸包邊
+        ghosts[0].n[0] = ghosts[2]  # b->a 之後是 a->c
+        ghosts[0].n[1] = ghosts[1]  # 之前是 c->b
+        ghosts[1].n[0] = ghosts[0]
+        ghosts[1].n[1] = ghosts[2]
+        ghosts[2].n[0] = ghosts[1]
+        ghosts[2].n[1] = ghosts[0]
+        for tri in [t] + ghosts:
+            self.triangles[tri] = None
+        for site in (a, b, c):
+            self.vertex_triangle[site] = t
+        self.site_list.extend((a, b, c))
+        self.last = t
+
+        rest = [q for q in self.pending if q is not a and q is not b and q is not c]
+        self.pending = []
+        for q in rest:
+            self.insert(q)
+        return [], list(self.triangles)
+
+    def hull(self, ghost=None):
+        """從 ghost 三角形沿著凸包繞一圈得到凸包，O(h)；沒給 ghost 時先線性找一個"""
+        if not self.triangles:
+            return ConvexHull.from_points(self.pending)
+        if ghost is None:
+            ghost = next(t for t in self.triangles if t.is_ghost)
+        # ghost 的 v[0] -> v[1] 與外積 > 0 的方向相反，沿 n[0] 走一圈後反過來
+        ring = []
+        g = ghost
+        while True:
+            ring.append(g.v[0])
+            g = g.n[0]
+            if g is ghost:
+                break
+        ring.reverse()
+        count = len(ring)
+        # 凸包邊上共線的點不算凸包頂點（與 ConvexHull.from_points 一致）
+        points = [ring[i] for i in range(count)
+                  if orient2d(ring[i - 1], ring[i], ring[(i + 1) % count]) != 0]
+        first = min(range(len(points)), key=lambda i: (points[i].x, points[i].y))
+        points = points[first:] + points[:first]
+        right = max(range(len(points)), key=lambda i: (points[i].x, points[i].y))
+        return ConvexHull(points, right)
+
+    def movable_star(self, p, q):
+        """site p 能不能原地移到 q：可以就回傳 p 的 star，不行回傳 None
+
+        p 不在凸包上、而且換成 q 之後 star 裡每個三角形都還是外積 > 0 的方向時，
+        只要改掉頂點的座標，三角化仍然合法（之後再用 flip_to_delaunay 修正 Delaunay 性質）。
+        """
+        if q in self.vertex_triangle:
+            return None
+        star = self.star(p)
+        for t in star:
+            if t.is_ghost:
+                return None
+            i = t.v.index(p)
+            if orient2d(q, t.v[(i + 1) % 3], t.v[(i + 2) % 3]) <= 0:
+                return None
+        return star
+
+    def move(self, star, p, q):
+        """把 star（movable_star 的結果）裡的 p 換成 q，不改變任何鄰接關係"""
+        for t in star:
+            t.v[t.v.index(p)] = q
+        del self.vertex_triangle[p]
+        self.vertex_triangle[q] = star[0]
+        self.site_list.append(q)
+
+    def flip_to_delaunay(self, triangles):
+        """從 triangles 的每條邊開始做 Lawson flip，直到這一帶重新滿足 Delaunay 性質
+
+        只有頂點移動過的三角形周圍的邊可能不再是 Delaunay，
+        每次 flip 只把四邊形外圍的四條邊放回佇列，工作量與實際 flip 的次數成正比。
+        回傳 (被移除的三角形, 新增的三角形)；過程中產生又被 flip 掉的三角形兩邊都不列。
+        """
+        removed = {}
+        added = {}
+        queue = [(t, i) for t in triangles for i in range(3)]
+        while queue:
+            t, i = queue.pop()
+            if not t.alive or t.is_ghost:
+                continue
+            nb = t.n[i]
+            if nb.is_ghost:
+                continue
+            j = nb.neighbor_index(t)
+            c, a, b = t.v[i], t.v[(i + 1) % 3], t.v[(i + 2) % 3]
+            d = nb.v[j]
+            if incircle(c, a, b, d) <= 0:
+                continue
+
+            # 四邊形 c, a, d, b 把對角線 a-b 換成 c-d
+            t1 = Triangle(c, a, d)
+            t2 = Triangle(d, b, c)
+            t1.n = [nb.n[(j + 1) % 3], t2, t.n[(i + 2) % 3]]
+            t2.n = [t.n[(i + 1) % 3], t1, nb.n[(j + 2) % 3]]
+            for new, k, old in ((t1, 0, nb), (t1, 2, t), (t2, 0, t), (t2, 2, nb)):
+                outer = new.n[k]
+                outer.n[outer.neighbor_index(old)] = new
+            for old in (t, nb):
+                old.alive = False
+                self.triangles.pop(old, None)
+                if old in added:
+                    del added[old]  # 這一輪才產生又被 flip 掉的
+                else:
+                    removed[old] = None
+            for new in (t1, t2):
+                self.triangles[new] = None
+                added[new] = None
+                for site in new.v:
+                    self.vertex_triangle[site] = new
+                queue.append((new, 0))
+                queue.append((new, 2))
+            self.last = t1
+        return list(removed), list(added)
+
+    def remove(self, p):
+        """刪除一個 site，回傳 (被移除的三角形, 新增的三角形)；不存在的點不做任何事
+
+        挖掉 p 周圍的三角形（star）後，洞的邊界是 p 的相鄰 site 依序圍成的多邊形。
+        每次切掉一個耳朵（多邊形上相鄰三點的三角形），總是選外接圓對 p 的 power 最小的那個
+        （Devillers 的刪除法），切下來的就是這些相鄰 site 的 Delaunay 三角形；
+        p 在凸包上時切到沒有凸的耳朵為止，剩下的鏈就是新的凸包，補上 ghost。
+        耳朵放在 heap 裡，O(d log d)，d 是 p 的相鄰 site 數；
+        凸包上的點要另外檢查耳朵的外接圓是空的，最差 O(d^2)。
+        刪到全部共線時退回 pending 狀態，回傳 ([], [])。
+        """
+        p = p if isinstance(p, Point) else Point(*p)
+        if not self.triangles:
+            if p in self.pending:
+                self.pending.remove(p)
+            return [], []
+        if p not in self.vertex_triangle:
+            return [], []
+
+        star = self.star(p)
+        for t in star:
+            t.alive = False
+            self.triangles.pop(t, None)
+        del self.vertex_triangle[p]
+
+        # 洞的多邊形（依外積 > 0 的方向）以及每條邊外側的三角形
+        link = []
+        outside = {}
+        for t in star:
+            i = t.v.index(p)
+            u, w = t.v[(i + 1) % 3], t.v[(i + 2) % 3]
+            link.append(u)
+            outside[(u, w)] = t.n[i]
+        if all(t.is_ghost for t in outside.values()):
+            # 實心三角形都含 p：剩下的點就是 link 上的點，可能全部共線，直接重新插入
+            self.triangles = {}
+            self.vertex_triangle = {}
+            self.site_list = []
+            self.last = None
+            for q in link:
+                if q is not None:
+                    self.insert(q)
+            return [], []
+        count = len(link)
+        nxt = {link[k]: link[(k + 1) % count] for k in range(count)}
+        prv = {link[k]: link[k - 1] for k in range(count)}
+
+        new_triangles = []
+
+        def make_triangle(a, b, c):
+            tri = Triangle(a, b, c)
+            for k in range(3):
+                e0, e1 = tri.v[(k + 1) % 3], tri.v[(k + 2) % 3]
+                other = outside.pop((e0, e1), None)
+                if other is None:
+                    # 新的對角線：另一側的三角形之後才會切出來
+                    outside[(e1, e0)] = tri
+                    continue
+                tri.n[k] = other
+                for j in range(3):
+                    if other.v[(j + 1) % 3] is e1 and other.v[(j + 2) % 3] is e0:
+                        other.n[j] = tri
+                        break
+            new_triangles.append(tri)
+            return tri
+
+        heap = []
+        counter = 0
+
+        def push_ear(v):
+            nonlocal counter
+            a, c = prv[v], nxt[v]
+            if v is None or a is None or c is None:
+                return
+            o = orient2d(a, v, c)
+            # 只切凸的、而且不含 p 的耳朵（p 要在 a-c 不同於 v 的那一側）
+            if o <= 0 or orient2d(a, c, p) < 0:
+                return
+            # p 對耳朵外接圓的 power（與圓心距離平方減半徑平方）取負號，heap 先取出 power 最大的
+            priority = incircle(a, v, c, p) / o
+            heapq.heappush(heap, (priority, counter, v, a, c))
+            counter += 1
+
+        on_hull = None in nxt
+        for v in link:
+            push_ear(v)
+        while count > 3 and heap:
+            _, _, v, a, c = heapq.heappop(heap)
+            if v not in nxt or prv[v] is not a or nxt[v] is not c:
+                continue  # 已經過期的耳朵
+            if on_hull and any(q is not None and q is not a and q is not v and q is not c
+                               and incircle(a, v, c, q) > 0 for q in link):
+                # p 在凸包上時洞不是繞著 p 的星形，power 最小不保證是 Delaunay，要逐一檢查
+                continue
+            make_triangle(a, v, c)
+            del nxt[v], prv[v]
+            nxt[a] = c
+            prv[c] = a
+            count -= 1
+            push_ear(a)
+            push_ear(c)
+
+        if on_hull:
+            # 凸包上的點：剩下的鏈 y ... x 往外凸，每條邊與無限遠點連成 ghost
+            q = nxt[None]
+            while nxt[q] is not None:
+                make_triangle(q, nxt[q], None)
+                q = nxt[q]
+        else:
+            a = next(iter(nxt))
+            make_triangle(a, nxt[a], nxt[nxt[a]])
+
+        for t in new_triangles:
+            self.triangles[t] = None
+            for site in t.v:
+                if site is not None:
+                    self.vertex_triangle[site] = t
+        self.last = new_triangles[0]
+        # site_list 裡刪掉的點在抽樣時會被略過；累積太多時重新整理一次
+        if len(self.site_list) > 2 * len(self.vertex_triangle) + 16:
+            self.site_list = [q for q in self.site_list if q in self.vertex_triangle]
+        return star, new_triangles
+
+    # ---- Voronoi 對偶 ----
+
+    def to_voronoi(self, extension=2000):
+        """取對偶得到 VoronoiDiagram：外心是 VoronoiVertex，每條 Delaunay 邊對應一條 VoronoiEdge"""
+        vd = VoronoiDiagram()
+        sites = sorted(self.sites, key=lambda p: (p.x, p.y))
+        for site in sites:
+            vd.add_point(site)
+        vd.hull = self.hull()
+        vd.triangulation = self
+
+        if not self.triangles:
+            # 全部共線：相鄰兩點的中垂線互相平行，都是完整的直線
+            for a, b in zip(sites, sites[1:]):
+                start, end = VoronoiEdge.get_perpendicular_bisector_unlimited(a, b, extension)
+                edge = VoronoiEdge(a, b)
+                edge.set_start_vertex(start)
+                edge.set_end_vertex(end)
+                vd.add_vertex(start)
+                vd.add_vertex(end)
+                vd.add_edge(edge)
+            return vd
+
+        for t in self.triangles:
+            if not t.is_ghost and t not in vd.dual_vertices:
+                dual_vertex(vd, t)
+        for t in self.triangles:
+            if not t.is_ghost:
+                for i in range(3):
+                    dual_edge(vd, t, i, extension)
+        return vd
+
+    def to_voronoi_arrays(self, extension=2000):
+        """與 to_voronoi 相同的對偶，但直接寫進 VoronoiArrays，不建立任何 vertex / edge 物件"""
+        sites = sorted(self.sites, key=lambda p: (p.x, p.y))
+        arrays = VoronoiArrays(len(sites))
+        site_ids = {}
+        for site in sites:
+            site_ids[site] = arrays.add_site(site.x, site.y)
+        hull = self.hull()
+        arrays.hull = array('i', (site_ids[p] for p in hull.points))
+        arrays.hull_right_index = hull.right_index
+
+        if not self.triangles:
+            for a, b in zip(sites, sites[1:]):
+                start, end = VoronoiEdge.get_perpendicular_bisector_unlimited(a, b, extension)
+                arrays.add_edge(site_ids[a], site_ids[b],
+                                arrays.add_vertex(start.x, start.y), arrays.add_vertex(end.x, end.y))
+            return arrays.trim()
+
+        # 外心：共圓的相鄰三角形共用同一個 vertex id（與 dual_vertex 相同的擴散）
+        vertex_of = {}
+        for t in self.triangles:
+            if t.is_ghost or t in vertex_of:
+                continue
+            cx, cy = t.circumcenter()
+            vid = arrays.add_vertex(cx, cy, tuple(site_ids[v] for v in t.v))
+            vertex_of[t] = vid
+            stack = [t]
+            while stack:
+                s = stack.pop()
+                for i in range(3):
+                    nb = s.n[i]
+                    if nb.is_ghost or nb in vertex_of:
+                        continue
+                    if incircle(s.v[0], s.v[1], s.v[2], nb.v[nb.neighbor_index(s)]) == 0:
+                        vertex_of[nb] = vid
+                        stack.append(nb)
+
+        done = set()
+        for t in self.triangles:
+            if t.is_ghost:
+                continue
+            for i in range(3):
+                a, b = t.v[(i + 1) % 3], t.v[(i + 2) % 3]
+                ia, ib = site_ids[a], site_ids[b]
+                key = (ia, ib) if ia < ib else (ib, ia)
+                if key in done:
+                    continue
+                done.add(key)
+                nb = t.n[i]
+                start = vertex_of[t]
+                if nb.is_ghost:
+                    dx, dy = b.y - a.y, -(b.x - a.x)
+                    length = (dx * dx + dy * dy) ** 0.5
+                    end = arrays.add_vertex(arrays.vertex_x[start] + dx / length * extension,
+                                            arrays.vertex_y[start] + dy / length * extension)
+                else:
+                    end = vertex_of[nb]
+                    if end == start:
+                        continue
+                arrays.add_edge(ia, ib, start, end)
+        return arrays.trim()
+
+
+def edge_key(a, b):
+    """Delaunay 邊不分方向的 key"""
+    return (a, b) if (a.x, a.y) < (b.x, b.y) else (b, a)
+
+
+def dual_vertex(vd, t):
+    """替實心三角形 t 指定對偶的 VoronoiVertex
+
+    共圓的相鄰三角形外心相同，共用同一個 VoronoiVertex：
+    若某個已有 vertex 的鄰居與 t 共圓就沿用它，否則建立新的，再擴散到共圓且還沒有 vertex 的鄰居。
+    """
+    vertex = None
+    for i in range(3):
+        nb = t.n[i]
+        if nb.is_ghost or nb not in vd.dual_vertices:
+            continue
+        if incircle(t.v[0], t.v[1], t.v[2], nb.v[nb.neighbor_index(t)]) == 0:
+            vertex = live_vertex(vd, nb)
+            break
+    if vertex is None:
+        cx, cy = t.circumcenter()
+        vertex = VoronoiVertex(cx, cy, sites=tuple(t.v))
+        vd.add_vertex(vertex)
+    vd.dual_vertices[t] = vertex
+    stack = [t]
+    while stack:
+        s = stack.pop()
+        for i in range(3):
+            nb = s.n[i]
+            if nb.is_ghost or nb in vd.dual_vertices:
+                continue
+            opposite = nb.v[nb.neighbor_index(s)]
+            if incircle(s.v[0], s.v[1], s.v[2], opposite) == 0:
+                vd.dual_vertices[nb] = vertex
+                stack.append(nb)
+    return vertex
+
+
+def live_vertex(vd, t):
+    """t 的對偶頂點；局部更新時它可能因為暫時沒有邊而被移出 vd.vertices，要用時補回去"""
+    vertex = vd.dual_vertices[t]
+    if not vd.has_vertex(vertex):
+        vd.add_vertex(vertex)
+    return vertex
+
+
+def dual_edge(vd, t, i, extension=2000):
+    """建立實心三角形 t 第 i 條邊（v[i] 對面）對偶的 VoronoiEdge；已存在或長度為零時不做事"""
+    a, b = t.v[(i + 1) % 3], t.v[(i + 2) % 3]
+    key = edge_key(a, b)
+    if key in vd.dual_edges:
+        return None
+    nb = t.n[i]
+    if nb.is_ghost:
+        # 凸包邊：從外心往凸包外側（t 的 a->b 右邊）延伸的射線
+        start = live_vertex(vd, t)
+        dx, dy = b.y - a.y, -(b.x - a.x)
+        length = (dx * dx + dy * dy) ** 0.5
+        end = VoronoiVertex(start.x + dx / length * extension, start.y + dy / length * extension)
+        vd.add_vertex(end)
+    else:
+        if vd.dual_vertices[t] is vd.dual_vertices[nb]:
+            return None
+        start = live_vertex(vd, t)
+        end = live_vertex(vd, nb)
+    edge = VoronoiEdge(a, b)
+    edge.set_start_vertex(start)
+    edge.set_end_vertex(end)
+    vd.add_edge(edge)
+    vd.dual_edges[key] = edge
+    return edge
+
+
+def detach_dual(vd, triangles, affected):
+    """拿掉 triangles 上每條邊的對偶邊與三角形的對偶頂點，碰到的 site 加進 affected"""
+    stale_vertices = []
+    for t in triangles:
+        for i in range(3):
+            a, b = t.v[(i + 1) % 3], t.v[(i + 2) % 3]
+            if a is None or b is None:
+                continue
+            edge = vd.dual_edges.pop(edge_key(a, b), None)
+            if edge is not None:
+                vd.remove_edge(edge)
+                stale_vertices.append(edge.start_vertex)
+                stale_vertices.append(edge.end_vertex)
+        vertex = vd.dual_vertices.pop(t, None)
+        if vertex is not None:
+            stale_vertices.append(vertex)
+        affected.update(site for site in t.v if site is not None)
+    # 不再被任何邊或三角形使用的頂點（被挖掉的外心、射線的遠端點）一併移除
+    for vertex in dict.fromkeys(stale_vertices):
+        if vertex.degree == 0:
+            vd.remove_vertex(vertex)
+
+
+def attach_dual(vd, triangles, affected, extension=2000):
+    """替 triangles 建立對偶頂點與對偶邊，碰到的 site 加進 affected"""
+    for t in triangles:
+        if not t.is_ghost and t not in vd.dual_vertices:
+            dual_vertex(vd, t)
+    new_ghost = None
+    for t in triangles:
+        affected.update(site for site in t.v if site is not None)
+        if t.is_ghost:
+            # ghost 對應的凸包邊由另一側的實心三角形負責產生射線
+            new_ghost = t
+            solid = t.n[2]
+            dual_edge(vd, solid, solid.neighbor_index(t), extension)
+        else:
+            for i in range(3):
+                dual_edge(vd, t, i, extension)
+    if new_ghost is not None:
+        vd.hull = vd.triangulation.hull(new_ghost)
+
+
+def update_voronoi(vd, removed, added, extension=2000):
+    """DelaunayTriangulation.insert() / remove() 之後局部更新對偶的 VoronoiDiagram
+
+    removed / added 是 insert() 回傳的兩組三角形：先拿掉 removed 上每條邊的對偶邊，
+    再替 added 建立頂點與對偶邊。只碰到這些三角形，與整張圖的大小無關。
+    回傳受影響的 site（需要重接半邊的 cell）。
+    """
+    affected = set()
+    detach_dual(vd, removed, affected)
+    attach_dual(vd, added, affected, extension)
+    return affected
+
+
+class DelaunayEngine:
+    """先建 Delaunay triangulation 再取對偶的 Voronoi 引擎，結果上附帶 triangulation"""
+
+    def __init__(self, extension=2000, seed=0):
+        self.extension = extension
+        self.seed = seed
+
+    def build(self, points):
+        points = [p if isinstance(p, Point) else Point(*p) for p in points]
+        dt = DelaunayTriangulation(points, seed=self.seed)
+        return dt.to_voronoi(self.extension)
+
+    def build_arrays(self, points):
+        """同 build，但回傳 VoronoiArrays（不保留 triangulation）"""
+        points = [p if isinstance(p, Point) else Point(*p) for p in points]
+        dt = DelaunayTriangulation(points, seed=self.seed)
+        return dt.to_voronoi_arrays(self.extension)
@@ -0,0 +1,444 @@
+#演算法部分：Fortune sweep-line 版本的 Voronoi Diagram 引擎
+#beach line 用 treap（平衡二元樹）維護，事件佇列用 heapq，整體 O(n log n)
+#輸出與 VoronoiEngine 相同的 VoronoiDiagram，可以互相比對
+from datastructer import *
+from predicates import orient2d, incircle
+from fractions import Fraction
+import heapq
+import random
+
+_EPSILON = 2.0 ** -52
+
+
+# beach line 上的一段拋物線（同時是 treap 的節點）
+class _Arc:
+    def __init__(self, site, priority):
+        self.site = site
+        # treap 結構
+        self.priority = priority
+        self.parent = None
+        self.left = None
+        self.right = None
+        # beach line 上的前後順序
+        self.prev = None
+        self.next = None
+        # 與 next 之間的 breakpoint 正在描出的邊：(_SweepEdge, 端點索引)
+        self.edge_right = None
+        # 會讓這段拋物線消失的 circle event
+        self.event = None
+
+
+# sweep 過程中的 Voronoi 邊：兩個端點各自由一個 breakpoint 往 dirs[i] 的方向描出
+class _SweepEdge:
+    def __init__(self, site1, site2):
+        self.site1 = site1
+        self.site2 = site2
+        self.ends = [None, None]   # 兩端的 VoronoiVertex，None 表示往無限遠延伸
+        self.dirs = [None, None]   # 兩端延伸的方向（未正規化）
+
+
+class _CircleEvent:
+    def __init__(self, arc, center):
+        self.arc = arc
+        self.center = center
+        self.valid = True
+
+
+# 事件佇列的排序鍵：sweep line 上的位置 y + sqrt(r2)（site event 的 r2 = 0，circle event 是圓的最低點），
+# 相同時依 x、再依加入順序。先比浮點數值，兩邊的誤差範圍重疊時才用 Fraction 精確比較，
+# 共圓/幾乎共圓時先後順序才不會亂掉
+class _EventKey:
+    __slots__ = ('low', 'high', 'exact', 'sites', 'x', 'order')
+
+    def __init__(self, value, x, order, error=0.0, exact=None, sites=None):
+        # 真正的位置一定在 [low, high] 之內
+        self.low = value - error
+        self.high = value + error
+        self.exact = exact   # (Fraction y, Fraction r2)；circle event 需要時才由 sites 算出
+        self.sites = sites
+        self.x = x
+        self.order = order
+
+    def _exact(self):
+        if self.exact is None:
+            a = self.sites[0]
+            ux, uy = exact_center_offset(*self.sites)
+            self.exact = (Fraction(a.y) + uy, ux * ux + uy * uy)
+        return self.exact
+
+    def __lt__(self, other):
+        if self.high < other.low:
+            return True
+        if other.high < self.low:
+            return False
+        if self.low != self.high or other.low != other.high:
+            sign = compare_sqrt_sum(*self._exact(), *other._exact())
+            if sign != 0:
+                return sign < 0
+        elif self.low != other.low:
+            return self.low < other.low
+        return (self.x, self.order) < (other.x, other.order)
+
+
+def exact_center_offset(a, b, c):
+    """a, b, c 外接圓圓心相對於 a 的位移，用 Fraction 精確計算"""
+    ax, ay = Fraction(a.x), Fraction(a.y)
+    bx, by = Fraction(b.x) - ax, Fraction(b.y) - ay
+    cx, cy = Fraction(c.x) - ax, Fraction(c.y) - ay
+    b2 = bx * bx + by * by
+    c2 = cx * cx + cy * cy
+    d = 2 * (bx * cy - by * cx)
+    return (cy * b2 - by * c2) / d, (bx * c2 - cx * b2) / d
+
+
+def compare_sqrt_sum(a, p, b, q):
+    """精確比較 a + sqrt(p) 與 b + sqrt(q)（p, q >= 0），回傳 -1 / 0 / 1"""
+    # 比較 t + sqrt(p) 與 sqrt(q)，t = a - b
+    t = a - b
+    if t < 0 and t * t > p:
+        return -1   # 左邊是負的，右邊 >= 0
+    # 兩邊都 >= 0，平方後比較 2 t sqrt(p) 與 m
+    m = q - t * t - p
+    if t == 0 or p == 0:
+        return (m < 0) - (m > 0)
+    if t > 0:
+        if m < 0:
+            return 1
+        s = 4 * t * t * p - m * m
+    else:
+        if m > 0:
+            return -1
+        s = m * m - 4 * t * t * p
+    return (s > 0) - (s < 0)
+
+
+# beach line：以 treap 保存拋物線的左右順序，查詢/插入/刪除都是期望 O(log n)
+class _BeachLine:
+    def __init__(self, rng):
+        self.root = None
+        self.rng = rng
+
+    def new_arc(self, site):
+        return _Arc(site, self.rng.random())
+
+    def find(self, x, sweep_y):
+        """找出在 x 位置、sweep line 位於 sweep_y 時正上方的拋物線"""
+        node = self.root
+        while node is not None:
+            if node.prev is not None and x < breakpoint_x(node.prev.site, node.site, sweep_y):
+                if node.left is None:
+                    return node
+                node = node.left
+            elif node.next is not None and x > breakpoint_x(node.site, node.next.site, sweep_y):
+                if node.right is None:
+                    return node
+                node = node.right
+            else:
+                return node
+        return None
+
+    def last(self):
+        node = self.root
+        while node is not None and node.right is not None:
+            node = node.right
+        return node
+
+    def insert_after(self, node, arc):
+        """把 arc 插入到 node 的下一個位置"""
+        if node is None:
+            self.root = arc
+            return
+        if node.right is None:
+            node.right = arc
+            arc.parent = node
+        else:
+            child = node.right
+            while child.left is not None:
+                child = child.left
+            child.left = arc
+            arc.parent = child
+        arc.prev = node
+        arc.next = node.next
+        if node.next is not None:
+            node.next.prev = arc
+        node.next = arc
+        while arc.parent is not None and arc.priority < arc.parent.priority:
+            self._rotate_up(arc)
+
+    def remove(self, arc):
+        # 旋轉到葉子再拔掉
+        while arc.left is not None or arc.right is not None:
+            if arc.right is None or (arc.left is not None and arc.left.priority < arc.right.priority):
+                self._rotate_up(arc.left)
+            else:
+                self._rotate_up(arc.right)
+        if arc.parent is None:
+            self.root = None
+        elif arc.parent.left is arc:
+            arc.parent.left = None
+        else:
+            arc.parent.right = None
+        arc.parent = None
+        if arc.prev is not None:
+            arc.prev.next = arc.next
+        if arc.next is not None:
+            arc.next.prev = arc.prev
+        arc.prev = arc.next = None
+
+    def _rotate_up(self, x):
+        p = x.parent
+        g = p.parent
+        if p.left is x:
+            p.left = x.right
+            if x.right is not None:
+                x.right.parent = p
+            x.right = p
+        else:
+            p.right = x.left
+            if x.left is not None:
+                x.left.parent = p
+            x.left = p
+        p.parent = x
+        x.parent = g
+        if g is None:
+            self.root = x
+        elif g.left is p:
+            g.left = x
+        else:
+            g.right = x
+
+
+def breakpoint_x(p, q, sweep_y):
+    """左拋物線 p 與右拋物線 q 在 sweep line 位於 sweep_y 時交點的 X
+
+    畫面座標 Y 向下，sweep line 往 Y 增加的方向掃，拋物線開口朝上（Y 較小的一側）。
+    """
+    if p.y == q.y:
+        return (p.x + q.x) / 2
+    if p.y == sweep_y:
+        return p.x
+    if q.y == sweep_y:
+        return q.x
+    # 拋物線 y = (fy + l) / 2 - (x - fx)^2 / (2 (l - fy))，兩式相減解二次方程式
+    kp = 1 / (2 * (sweep_y - p.y))
+    kq = 1 / (2 * (sweep_y - q.y))
+    a = kq - kp
+    b = 2 * (kp * p.x - kq * q.x)
+    c = kq * q.x * q.x - kp * p.x * p.x + (p.y - q.y) / 2
+    disc = max(b * b - 4 * a * c, 0.0) ** 0.5
+    r1 = (-b - disc) / (2 * a)
+    r2 = (-b + disc) / (2 * a)
+    # 離 sweep line 較近（Y 較大）的拋物線較窄，被夾在兩根之間
+    if p.y > q.y:
+        return max(r1, r2)
+    return min(r1, r2)
+
+
+def bisector_direction(p, q):
+    """左 p、右 q 之間的 breakpoint 隨 sweep line 移動的方向"""
+    return (p.y - q.y, q.x - p.x)
+
+
+class FortuneEngine:
+    """Fortune sweep-line 的 Voronoi 引擎
+
+    輸入點列表，回傳與 VoronoiEngine 相同格式的 VoronoiDiagram：
+    每條 VoronoiEdge 帶 site1/site2，共用的 VoronoiVertex 記錄 site 三元組，
+    射線延伸 extension 的長度。
+    """
+
+    def __init__(self, extension=2000, seed=0):
+        self.extension = extension
+        self.seed = seed
+
+    def build(self, points):
+        points = [p if isinstance(p, Point) else Point(*p) for p in points]
+        sites = sorted(set(points), key=lambda p: (p.x, p.y))
+
+        vd = VoronoiDiagram()
+        for site in sites:
+            vd.add_point(site)
+        vd.hull = ConvexHull.from_points(sites)
+        if len(sites) < 2:
+            return vd
+
+        beach = _BeachLine(random.Random(self.seed))
+        edges = []
+        # site event 事先依 (y, x) 排好，heap 裡只放 circle event；同一位置時 site event 先處理
+        site_events = sorted(sites, key=lambda p: (p.y, p.x))
+        events = []
+        counter = len(site_events)
+
+        # 最上方同一列（Y 相同）的點：拋物線退化成垂直線，只能依 X 順序排在 beach line 右端
+        top_y = site_events[0].y
+
+        i = 0
+        site_key = None
+        while i < len(site_events) or events:
+            if i < len(site_events) and site_key is None:
+                site = site_events[i]
+                site_key = _EventKey(site.y, site.x, i, exact=(Fraction(site.y), 0))
+            if events and (site_key is None or events[0][0] < site_key):
+                _, event = heapq.heappop(events)
+                if event.valid:
+                    counter = self._circle_event(beach, event, edges, events, counter)
+                continue
+            site = site_events[i]
+            i += 1
+            site_key = None
+            if beach.root is None or site.y == top_y:
+                self._add_top_site(beach, site, edges)
+            else:
+                counter = self._site_event(beach, site, edges, events, counter)
+
+        self._finish_edges(vd, edges)
+        return vd
+
+    def _add_top_site(self, beach, site, edges):
+        last = beach.last()
+        arc = beach.new_arc(site)
+        beach.insert_after(last, arc)
+        if last is not None:
+            # 垂直的中垂線：往下的一端由 breakpoint 描出，往上的一端延伸到無限遠
+            edge = _SweepEdge(last.site, site)
+            edge.dirs[0] = bisector_direction(last.site, site)
+            edge.dirs[1] = bisector_direction(site, last.site)
+            edges.append(edge)
+            last.edge_right = (edge, 0)
+
+    def _site_event(self, beach, site, edges, events, counter):
+        arc = beach.find(site.x, site.y)
+        if arc.event is not None:
+            arc.event.valid = False
+            arc.event = None
+
+        # arc 被新的拋物線切成 arc | new_arc | arc_right
+        new_arc = beach.new_arc(site)
+        arc_right = beach.new_arc(arc.site)
+        arc_right.edge_right = arc.edge_right
+        beach.insert_after(arc, new_arc)
+        beach.insert_after(new_arc, arc_right)
+
+        # 兩個新的 breakpoint 往相反方向描出同一條中垂線
+        edge = _SweepEdge(arc.site, site)
+        edge.dirs[0] = bisector_direction(arc.site, site)
+        edge.dirs[1] = bisector_direction(site, arc.site)
+        edges.append(edge)
+        arc.edge_right = (edge, 0)
+        new_arc.edge_right = (edge, 1)
+
+        counter = self._check_circle_event(arc, events, counter)
+        counter = self._check_circle_event(arc_right, events, counter)
+        return counter
+
+    def _circle_event(self, beach, event, edges, events, counter):
+        arc = event.arc
+        left, right = arc.prev, arc.next
+        cx, cy = event.center
+        vertex = VoronoiVertex(cx, cy, sites=(left.site, arc.site, right.site))
+
+        # 兩個 breakpoint 在這裡相遇，各自描出的邊到此結束
+        for edge, end in (left.edge_right, arc.edge_right):
+            edge.ends[end] = vertex
+
+        # 從這個 vertex 開始新的 breakpoint（left 與 right 之間）
+        edge = _SweepEdge(left.site, right.site)
+        edge.ends[0] = vertex
+        edge.dirs[1] = bisector_direction(left.site, right.site)
+        edges.append(edge)
+        left.edge_right = (edge, 1)
+
+        beach.remove(arc)
+        for neighbor in (left, right):
+            if neighbor.event is not None:
+                neighbor.event.valid = False
+                neighbor.event = None
+        counter = self._check_circle_event(left, events, counter)
+        counter = self._check_circle_event(right, events, counter)
+        return counter
+
+    def _check_circle_event(self, arc, events, counter):
+        left, right = arc.prev, arc.next
+        if left is None or right is None:
+            return counter
+        a, b, c = left.site, arc.site, right.site
+        # 只有兩個 breakpoint 互相靠近（三點為外積 > 0 的方向）時拋物線才會消失
+        # 方向用精確判斷；圓心與最低點是浮點數，可能比實際早或晚一點，先後順序交給 _EventKey 精確比較
+        if orient2d(a, b, c) <= 0:
+            return counter
+        bx, by = b.x - a.x, b.y - a.y
+        cx, cy = c.x - a.x, c.y - a.y
+        b2 = bx * bx + by * by
+        c2 = cx * cx + cy * cy
+        d = 2 * (bx * cy - by * cx)
+        # 浮點數運算的誤差上界（相對誤差對各項絕對值的和估計，留足夠的餘量）
+        d_error = 16 * _EPSILON * (abs(bx * cy) + abs(by * cx))
+        if abs(d) > 2 * d_error:
+            ux = (cy * b2 - by * c2) / d
+            uy = (bx * c2 - cx * b2) / d
+            center_error = (16 * _EPSILON * (abs(cy) * b2 + abs(by) * c2 + abs(bx) * c2 + abs(cx) * b2)
+                            + (abs(ux) + abs(uy)) * d_error) / (abs(d) - d_error)
+            center = (a.x + ux, a.y + uy)
+            radius = (ux * ux + uy * uy) ** 0.5
+            event_y = center[1] + radius
+            error = 3 * center_error + 4 * _EPSILON * (abs(center[1]) + radius)
+        else:
+            # 三點幾乎共線，浮點數的圓心不可信，改用精確值，排序時一律精確比較
+            ux, uy = exact_center_offset(a, b, c)
+            center = (float(a.x + ux), float(a.y + uy))
+            event_y = center[1] + float(ux * ux + uy * uy) ** 0.5
+            error = float('inf')
+        event = _CircleEvent(arc, center)
+        arc.event = event
+        heapq.heappush(events, (_EventKey(event_y, center[0], counter, error, sites=(a, b, c)), event))
+        return counter + 1
+
+    def _finish_edges(self, vd, edges):
+        """把 sweep 得到的邊轉成 VoronoiEdge；同一點上的多個 vertex（共圓）合併成一個
+
+        兩端 vertex 的 site 三元組共用這條邊的兩個 site，另一個 site 剛好在 v0 的外接圓上
+        （incircle 精確為 0）時才是共圓造成的零長度邊。
+        """
+        merged = {}
+
+        def find(vertex):
+            while vertex in merged:
+                vertex = merged[vertex]
+            return vertex
+
+        for edge in edges:
+            v0, v1 = edge.ends
+            if v0 is not None and v1 is not None and v0 is not v1:
+                other = [s for s in v1.sites if s not in v0.sites]
+                if len(other) == 1 and incircle(*v0.sites, other[0]) == 0:
+                    merged[find(v1)] = find(v0)
+
+        added = set()
+
+        def add_vertex(vertex):
+            if vertex not in added:
+                added.add(vertex)
+                vd.add_vertex(vertex)
+
+        for edge in edges:
+            v0 = find(edge.ends[0]) if edge.ends[0] is not None else None
+            v1 = find(edge.ends[1]) if edge.ends[1] is not None else None
+            if v0 is not None and v1 is not None:
+                if v0 is v1:
+                    continue  # 共圓造成的零長度邊
+                start, end = v0, v1
+            elif v0 is not None or v1 is not None:
+                # 射線：從 vertex 往另一端的方向延伸
+                start = v0 if v0 is not None else v1
+                dx, dy = edge.dirs[1] if v0 is not None else edge.dirs[0]
+                length = (dx * dx + dy * dy) ** 0.5
+                end = VoronoiVertex(start.x + dx / length * self.extension, start.y + dy / length * self.extension)
+            else:
+                # 全部共線時沒有 vertex，整條中垂線都是邊
+                start, end = VoronoiEdge.get_perpendicular_bisector_unlimited(edge.site1, edge.site2, self.extension)
+            voronoi_edge = VoronoiEdge(edge.site1, edge.site2)
+            voronoi_edge.set_start_vertex(start)
+            voronoi_edge.set_end_vertex(end)
+            add_vertex(start)
+            add_vertex(end)
+            vd.add_edge(voronoi_edge)
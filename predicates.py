@@ -0,0 +1,74 @@
+#幾何判斷部分：方向（orient2d）、內積（inner2d）與外接圓（incircle）的精確判斷
+#先用浮點數算，結果的絕對值大於誤差上界時符號一定正確，直接回傳（絕大多數情況）；
+#否則改用 int / Fraction 精確重算，回傳的值符號一定正確，0 就是真的共線、垂直或共圓
+#誤差上界取自 Shewchuk, "Adaptive Precision Floating-Point Arithmetic and Fast Robust Geometric Predicates"
+from fractions import Fraction
+
+_EPSILON = 2.0 ** -53
+_CCW_BOUND = (3.0 + 16.0 * _EPSILON) * _EPSILON
+_ICC_BOUND = (10.0 + 96.0 * _EPSILON) * _EPSILON
+
+
+def _exact(v):
+    # float 轉成 Fraction 是精確的；整數（load_file 讀進來的點）直接用 int 算最快
+    return v if isinstance(v, (int, Fraction)) else Fraction(v)
+
+
+def cross(ux, uy, vx, vy):
+    """向量 u × v，> 0 表示 v 在 u 的外積 > 0 方向"""
+    left = ux * vy
+    right = uy * vx
+    det = left - right
+    if abs(det) > _CCW_BOUND * (abs(left) + abs(right)):
+        return det
+    return _exact(ux) * _exact(vy) - _exact(uy) * _exact(vx)
+
+
+def orient2d(a, b, c):
+    """(a->b) × (a->c) 的外積，> 0 表示 a, b, c 依外積 > 0 的方向排列，0 表示共線"""
+    left = (b.x - a.x) * (c.y - a.y)
+    right = (b.y - a.y) * (c.x - a.x)
+    det = left - right
+    if abs(det) > _CCW_BOUND * (abs(left) + abs(right)):
+        return det
+    ax, ay = _exact(a.x), _exact(a.y)
+    return (_exact(b.x) - ax) * (_exact(c.y) - ay) - (_exact(b.y) - ay) * (_exact(c.x) - ax)
+
+
+def inner2d(a, b, c):
+    """(a->b) · (a->c) 的內積，< 0 表示在 a 的夾角是鈍角，0 表示垂直"""
+    left = (b.x - a.x) * (c.x - a.x)
+    right = (b.y - a.y) * (c.y - a.y)
+    det = left + right
+    if abs(det) > _CCW_BOUND * (abs(left) + abs(right)):
+        return det
+    ax, ay = _exact(a.x), _exact(a.y)
+    return (_exact(b.x) - ax) * (_exact(c.x) - ax) + (_exact(b.y) - ay) * (_exact(c.y) - ay)
+
+
+def incircle(a, b, c, d):
+    """a, b, c 為外積 > 0 的方向時，d 在外接圓內為正、圓上為 0、圓外為負"""
+    adx, ady = a.x - d.x, a.y - d.y
+    bdx, bdy = b.x - d.x, b.y - d.y
+    cdx, cdy = c.x - d.x, c.y - d.y
+    bdxcdy, cdxbdy = bdx * cdy, cdx * bdy
+    cdxady, adxcdy = cdx * ady, adx * cdy
+    adxbdy, bdxady = adx * bdy, bdx * ady
+    alift = adx * adx + ady * ady
+    blift = bdx * bdx + bdy * bdy
+    clift = cdx * cdx + cdy * cdy
+    det = (alift * (bdxcdy - cdxbdy)
+           + blift * (cdxady - adxcdy)
+           + clift * (adxbdy - bdxady))
+    permanent = ((abs(bdxcdy) + abs(cdxbdy)) * alift
+                 + (abs(cdxady) + abs(adxcdy)) * blift
+                 + (abs(adxbdy) + abs(bdxady)) * clift)
+    if abs(det) > _ICC_BOUND * permanent:
+        return det
+    dx, dy = _exact(d.x), _exact(d.y)
+    adx, ady = _exact(a.x) - dx, _exact(a.y) - dy
+    bdx, bdy = _exact(b.x) - dx, _exact(b.y) - dy
+    cdx, cdy = _exact(c.x) - dx, _exact(c.y) - dy
+    return ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+            + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+            + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
@@ -0,0 +1,66 @@
+import pickle
+import random
+
+import pytest
+
+from datastructer import Point, VoronoiArrays
+from voronoi_engine import VoronoiEngine
+
+
+def random_points(n, seed, grid=False):
+    r = random.Random(seed)
+    if grid:
+        # 格點：大量共線、共圓
+        return [Point(r.randint(0, 8) * 50, r.randint(0, 8) * 50) for _ in range(n)]
+    return [Point(r.uniform(0, 600), r.uniform(0, 600)) for _ in range(n)]
+
+
+def diagram_signature(vd):
+    def vertex(v):
+        return (v.x, v.y) if v is not None else None
+    edges = sorted((tuple(sorted(((e.site1.x, e.site1.y), (e.site2.x, e.site2.y)))),
+                    sorted((vertex(e.start_vertex), vertex(e.end_vertex)), key=str)) for e in vd.edges)
+    vertices = sorted((v.x, v.y, v.sites is not None) for v in vd.vertices)
+    return sorted({(p.x, p.y) for p in vd.points}), edges, vertices, [(p.x, p.y) for p in vd.hull.points]
+
+
+def array_contents(arrays):
+    return [list(arr) for arr in (arrays.site_x, arrays.site_y, arrays.vertex_x, arrays.vertex_y,
+                                  arrays.vertex_sites, arrays.edge_site1, arrays.edge_site2,
+                                  arrays.edge_start, arrays.edge_end, arrays.hull)] + [arrays.hull_right_index]
+
+
+@pytest.mark.parametrize("algorithm", ["divide", "fortune", "delaunay"])
+@pytest.mark.parametrize("grid", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_arrays_match_objects(algorithm, grid, seed):
+    points = random_points(50, seed, grid)
+    arrays = VoronoiEngine().build(points, algorithm=algorithm, storage="arrays")
+    objects = VoronoiEngine().build(points, algorithm=algorithm)
+    assert isinstance(arrays, VoronoiArrays)
+    assert diagram_signature(arrays.to_diagram()) == diagram_signature(objects)
+    # 建好後已截掉預先配置的空間
+    assert len(arrays.edge_site1) == arrays.n_edges
+    assert len(arrays.vertex_x) == arrays.n_vertices
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_round_trip(seed):
+    vd = VoronoiEngine().build(random_points(80, seed), algorithm="delaunay")
+    arrays = VoronoiArrays.from_diagram(vd)
+    assert diagram_signature(arrays.to_diagram()) == diagram_signature(vd)
+    assert array_contents(VoronoiArrays.from_diagram(arrays.to_diagram())) == array_contents(arrays)
+    assert array_contents(pickle.loads(pickle.dumps(arrays))) == array_contents(arrays)
+
+
+def test_repeated_points_share_one_site():
+    points = random_points(20, 5)
+    vd = VoronoiEngine().build(points)
+    vd.points.append(Point(points[0].x, points[0].y))
+    arrays = VoronoiArrays.from_diagram(vd)
+    assert arrays.n_sites == 20
+
+
+def test_empty_input():
+    arrays = VoronoiEngine().build([], storage="arrays")
+    assert (arrays.n_sites, arrays.n_vertices, arrays.n_edges) == (0, 0, 0)
@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from datastructer import Point
+from delaunay import DelaunayTriangulation
+from predicates import incircle
+
+
+def random_points(n, seed):
+    r = random.Random(seed)
+    return [Point(r.uniform(0, 600), r.uniform(0, 600)) for _ in range(n)]
+
+
+def edge_set(dt):
+    return {frozenset(((a.x, a.y), (b.x, b.y))) for a, b in dt.edges()}
+
+
+def plain_insertion(points, jump=False):
+    dt = DelaunayTriangulation()
+    for p in points:
+        dt.insert(p, jump=jump)
+    return dt
+
+
+@pytest.mark.parametrize("n", [10, 63, 64, 300])
+@pytest.mark.parametrize("seed", range(5))
+def test_brio_matches_plain_insertion(n, seed):
+    # 一般位置的點 Delaunay triangulation 唯一，插入順序與點定位方式都不能改變結果
+    points = random_points(n, seed)
+    expected = edge_set(plain_insertion(points))
+    assert edge_set(DelaunayTriangulation(points, seed=seed)) == expected
+    assert edge_set(plain_insertion(points, jump=True)) == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_empty_circumcircles(seed):
+    points = random_points(80, seed)
+    dt = DelaunayTriangulation(points, seed=seed)
+    for t in dt.solid_triangles():
+        assert not any(incircle(*t.v, p) > 0 for p in points if p not in t.v)
@@ -0,0 +1,80 @@
+import math
+import random
+
+import pytest
+
+from datastructer import Point
+from delaunay import DelaunayEngine
+from fortune_engine import FortuneEngine
+
+
+def edge_sites(vd):
+    """以兩個 site 表示每條邊，與建構方式無關"""
+    return sorted(tuple(sorted(((e.site1.x, e.site1.y), (e.site2.x, e.site2.y)))) for e in vd.edges)
+
+
+def vertex_set(vd):
+    return sorted((round(v.x, 6), round(v.y, 6)) for v in vd.vertices if v.sites is not None)
+
+
+def finite_ends(vd):
+    """每條邊（以兩個 site 表示）的有限端點"""
+    return sorted((tuple(sorted(((e.site1.x, e.site1.y), (e.site2.x, e.site2.y)))),
+                   sorted((round(v.x, 6), round(v.y, 6)) for v in (e.start_vertex, e.end_vertex) if v.sites is not None))
+                  for e in vd.edges)
+
+
+def assert_matches_delaunay(points):
+    assert edge_sites(FortuneEngine().build(points)) == edge_sites(DelaunayEngine().build(points))
+
+
+def random_points(n, seed, kind):
+    r = random.Random(seed)
+    coords = set()
+    while len(coords) < n:
+        if kind == "float":
+            coords.add((r.uniform(0, 600), r.uniform(0, 600)))
+        elif kind == "int":
+            coords.add((r.randint(0, 600), r.randint(0, 600)))
+        else:
+            # 格點：大量共線、共圓
+            coords.add((r.randint(0, 8) * 50, r.randint(0, 8) * 50))
+    return [Point(x, y) for x, y in coords]
+
+
+@pytest.mark.parametrize("kind", ["float", "int", "grid"])
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_delaunay(kind, seed):
+    points = random_points(random.Random(seed).randint(2, 80), seed, kind)
+    vd = FortuneEngine().build(points)
+    expected = DelaunayEngine().build(points)
+    assert len(vd.edges) == len(expected.edges)
+    assert vertex_set(vd) == vertex_set(expected)
+    assert finite_ends(vd) == finite_ends(expected)
+
+
+def test_collinear_sites():
+    # 全部共線時沒有 vertex，每對相鄰的點各一條完整的中垂線
+    points = [Point(10 * i, 5 * i) for i in range(8)]
+    vd = FortuneEngine().build(points)
+    assert vertex_set(vd) == []
+    assert edge_sites(vd) == edge_sites(DelaunayEngine().build(points))
+
+
+@pytest.mark.parametrize("jitter", [0, 1e-13, 1e-11])
+@pytest.mark.parametrize("seed", range(10))
+def test_cocircular_with_jitter(jitter, seed):
+    # 圓上的點加上極小的擾動：circle event 的浮點數位置幾乎相同，先後順序要靠精確比較
+    r = random.Random(seed)
+    points = [Point(300 + 100 * math.cos(t) + r.uniform(-jitter, jitter),
+                    300 + 100 * math.sin(t) + r.uniform(-jitter, jitter))
+              for t in (r.uniform(0, 2 * math.pi) for _ in range(24))]
+    assert_matches_delaunay(points)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_decimal_grid(seed):
+    # 0.1 的倍數無法精確表示：三點精確判斷不共線，浮點數的行列式卻可能是 0
+    r = random.Random(seed)
+    points = list({Point(r.randint(0, 10) * 0.1, r.randint(0, 10) * 0.1) for _ in range(40)})
+    assert_matches_delaunay(points)
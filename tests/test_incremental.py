@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from datastructer import Point, VoronoiDiagram
+from delaunay import DelaunayEngine
+
+
+def site_key(e):
+    return tuple(sorted(((e.site1.x, e.site1.y), (e.site2.x, e.site2.y))))
+
+
+def diagram_signature(vd):
+    """site、每條邊的有限端點與凸包；與建構方式無關"""
+    points = sorted((p.x, p.y) for p in vd.points)
+    edges = sorted((site_key(e), sorted((round(v.x, 6), round(v.y, 6))
+                                        for v in (e.start_vertex, e.end_vertex) if v.sites is not None))
+                   for e in vd.edges)
+    vertices = sorted((round(v.x, 6), round(v.y, 6)) for v in vd.vertices if v.sites is not None)
+    hull = sorted((p.x, p.y) for p in vd.hull.points)
+    return points, edges, vertices, hull
+
+
+def assert_matches_rebuild(vd):
+    expected = DelaunayEngine().build(list(vd.points))
+    assert diagram_signature(vd) == diagram_signature(expected)
+    if not any(v.sites is not None for v in vd.vertices):
+        return  # 全部共線時 cell 是兩條平行線夾出的帶狀區域，邊界不是一條鏈
+    # 每個 cell 的半邊都重新接好：沿邊界走一圈剛好經過所有相鄰的 site
+    for site in vd.points:
+        neighbors = {e.site2 if e.site1 == site else e.site1 for e in expected.point_to_edges[site]}
+        assert sorted((p.x, p.y) for p in vd.faces[site].neighbors()) == sorted((p.x, p.y) for p in neighbors)
+
+
+def random_coords(n, seed, grid=False):
+    r = random.Random(seed)
+    if grid:
+        # 格點：大量共線、共圓
+        return [(r.randint(0, 8) * 50, r.randint(0, 8) * 50) for _ in range(n)]
+    return [(r.uniform(0, 600), r.uniform(0, 600)) for _ in range(n)]
+
+
+@pytest.mark.parametrize("grid", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_insert_matches_rebuild(seed, grid):
+    vd = VoronoiDiagram()
+    for i, (x, y) in enumerate(random_coords(40, seed, grid)):
+        vd.insert_site(Point(x, y))
+        if i % 5 == 4:
+            assert_matches_rebuild(vd)
+    assert_matches_rebuild(vd)
+
+
+def test_insert_duplicate_and_collinear():
+    vd = VoronoiDiagram()
+    for x in range(5):
+        assert vd.insert_site(Point(10 * x, 10 * x))
+    assert not vd.insert_site(Point(20, 20))
+    assert_matches_rebuild(vd)
+    # 第一個不共線的點讓 triangulation 從共線狀態長出三角形
+    vd.insert_site(Point(0, 40))
+    assert_matches_rebuild(vd)
+
+
+@pytest.mark.parametrize("grid", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_remove_matches_rebuild(seed, grid):
+    # 依隨機順序刪到剩兩個點，途中包含凸包上的點與共圓的洞
+    coords = list(dict.fromkeys(random_coords(40, seed, grid)))
+    vd = VoronoiDiagram()
+    for x, y in coords:
+        vd.insert_site(Point(x, y))
+    random.Random(seed).shuffle(coords)
+    for i, (x, y) in enumerate(coords[:-2]):
+        assert vd.remove_site(Point(x, y))
+        if i % 3 == 0 or len(vd.points) < 6:
+            assert_matches_rebuild(vd)
+    assert not vd.remove_site(Point(*coords[0]))
+
+
+def test_remove_down_to_collinear():
+    vd = VoronoiDiagram()
+    for x, y in [(0, 0), (10, 10), (20, 20), (30, 30), (0, 40)]:
+        vd.insert_site(Point(x, y))
+    vd.remove_site(Point(0, 40))
+    assert_matches_rebuild(vd)
+    # 再插回去要從共線狀態重新長出三角形
+    vd.insert_site(Point(0, 40))
+    assert_matches_rebuild(vd)
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from datastructer import ConvexHull, Point
+from delaunay import DelaunayEngine
+from voronoi_engine import VoronoiEngine
+
+
+def edge_map(vd):
+    """以兩個 site 對應每條邊（縮成一點的邊不算），與建構方式無關"""
+    edges = {}
+    for e in vd.edges:
+        if e.start_vertex.x == e.end_vertex.x and e.start_vertex.y == e.end_vertex.y:
+            continue
+        key = frozenset(((e.site1.x, e.site1.y), (e.site2.x, e.site2.y)))
+        assert key not in edges
+        edges[key] = e
+    return edges
+
+
+def finite_vertices(edge):
+    return sorted((round(v.x, 6), round(v.y, 6)) for v in (edge.start_vertex, edge.end_vertex) if v.sites is not None)
+
+
+def assert_matches_delaunay(vd, points):
+    expected = edge_map(DelaunayEngine().build(points))
+    actual = edge_map(vd)
+    assert set(actual) == set(expected)
+    for key, edge in actual.items():
+        assert finite_vertices(edge) == finite_vertices(expected[key])
+
+
+def random_points(n, seed, kind):
+    r = random.Random(seed)
+    coords = set()
+    while len(coords) < n:
+        if kind == "float":
+            coords.add((r.uniform(0, 600), r.uniform(0, 600)))
+        elif kind == "int":
+            coords.add((r.randint(0, 600), r.randint(0, 600)))
+        else:
+            # 格點：大量共線、共圓
+            coords.add((r.randint(0, 8) * 50, r.randint(0, 8) * 50))
+    return [Point(x, y) for x, y in coords]
+
+
+@pytest.mark.parametrize("kind", ["float", "int", "grid"])
+@pytest.mark.parametrize("seed", range(20))
+def test_divide_matches_delaunay(kind, seed):
+    points = random_points(random.Random(seed).randint(4, 60), seed, kind)
+    assert_matches_delaunay(VoronoiEngine().build_voronoi(points), points)
+
+
+def merge(left, right):
+    engine = VoronoiEngine()
+    left = [Point(x, y) for x, y in left]
+    right = [Point(x, y) for x, y in right]
+    return engine.merge_voronoi(engine.build_voronoi(left), engine.build_voronoi(right)), left + right
+
+
+def test_chain_passes_a_cell_twice():
+    # chain 先穿過 (294, 96)-(438, 67) 的中垂線，繞過 (438, 67) 之後又穿過同一條邊
+    vd, points = merge([(294.5413748538513, 96.36476047227349), (428.63255152225196, 335.97545520428685),
+                        (432.9962560706235, 599.964484834207), (438.78446248609356, 67.48661993809513)],
+                       [(460.014648097535, 16.119985194841192), (467.4165234204623, 223.74467670605995),
+                        (505.6025575326044, 215.67545053690984), (599.852497471457, 164.03375064522498)])
+    assert_matches_delaunay(vd, points)
+
+
+def test_obtuse_three_points_far_circumcenter():
+    # 幾乎共線的鈍角三角形：外心在很遠的地方，最長邊的中垂線要往遠離鈍角頂點的方向延伸
+    points = [Point(86, 289), Point(88, 579), Point(89, 550)]
+    assert_matches_delaunay(VoronoiEngine().build_voronoi(points), points)
+    vd, points = merge([(80, 73), (85, 87)], [(86, 289), (88, 579), (89, 550)])
+    assert_matches_delaunay(vd, points)
+
+
+def test_tangents_stop_at_innermost_collinear_point():
+    left = ConvexHull.from_points([Point(0, 0), Point(100, 0), Point(50, 80)])
+    right = ConvexHull.from_points([Point(200, 0), Point(300, 0), Point(250, 80)])
+    (upper_a, upper_b), (lower_a, lower_b) = ConvexHull.find_tangents(left, right)
+    assert left.points[upper_a] == Point(100, 0) and right.points[upper_b] == Point(200, 0)
+    assert left.points[lower_a] == Point(50, 80) and right.points[lower_b] == Point(250, 80)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_hull_merge_matches_from_points(seed):
+    points = sorted(random_points(random.Random(seed).randint(2, 40), seed, "grid"), key=lambda p: (p.x, p.y))
+    mid = len(points) // 2
+    left, right = ConvexHull.from_points(points[:mid]), ConvexHull.from_points(points[mid:])
+    merged = ConvexHull.merge(left, right, tangents=ConvexHull.find_tangents(left, right))
+    expected = ConvexHull.from_points(points)
+    assert merged.points == expected.points
+    assert merged.right_index == expected.right_index
+
+
+def test_collinear_bridge_matches_delaunay():
+    # 上切線所在的直線通過左右各兩個點
+    vd, points = merge([(0, 0), (100, 0), (50, 80)], [(200, 0), (300, 0), (250, 80)])
+    assert_matches_delaunay(vd, points)
+    assert [(p.x, p.y) for p in vd.hull.points] == [(0, 0), (300, 0), (250, 80), (50, 80)]
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from datastructer import Point, VoronoiDiagram
+from delaunay import DelaunayEngine
+
+
+def edge_set(vd):
+    """以兩個 site 表示每條邊，與建構方式無關"""
+    return {frozenset(((e.site1.x, e.site1.y), (e.site2.x, e.site2.y))) for e in vd.edges}
+
+
+def build(coords):
+    vd = VoronoiDiagram()
+    for x, y in coords:
+        vd.insert_site(Point(x, y))
+    return vd
+
+
+def assert_matches(vd, coords):
+    assert sorted((p.x, p.y) for p in vd.points) == sorted(coords)
+    assert edge_set(vd) == edge_set(DelaunayEngine().build([Point(x, y) for x, y in coords]))
+
+
+def random_coords(n, seed):
+    r = random.Random(seed)
+    return [(r.uniform(0, 600), r.uniform(0, 600)) for _ in range(n)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_swap(seed):
+    coords = random_coords(12, seed)
+    vd = build(coords)
+    a, b = coords[0], coords[5]
+    vd.move_sites({Point(*a): Point(*b), Point(*b): Point(*a)})
+    assert_matches(vd, coords)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_three_cycle(seed):
+    coords = random_coords(12, seed)
+    vd = build(coords)
+    a, b, c = coords[1], coords[4], coords[9]
+    vd.move_sites([(Point(*a), Point(*b)), (Point(*b), Point(*c)), (Point(*c), Point(*a))])
+    assert_matches(vd, coords)
+
+
+def test_three_cycle_with_new_position():
+    coords = random_coords(15, 7)
+    vd = build(coords)
+    a, b = coords[2], coords[3]
+    vd.move_sites([(Point(*a), Point(*b)), (Point(*b), Point(301.5, 299.25))])
+    expected = [c for c in coords if c != a] + [(301.5, 299.25)]
+    assert_matches(vd, expected)
+
+
+def test_move_onto_fixed_site_raises():
+    coords = random_coords(10, 3)
+    vd = build(coords)
+    before = edge_set(vd)
+    with pytest.raises(ValueError):
+        vd.move_sites({Point(*coords[0]): Point(*coords[1])})
+    assert edge_set(vd) == before
+
+
+def test_two_sites_onto_same_target_raises():
+    coords = random_coords(10, 4)
+    vd = build(coords)
+    with pytest.raises(ValueError):
+        vd.move_sites([(Point(*coords[0]), Point(10.0, 10.0)), (Point(*coords[1]), Point(10.0, 10.0))])
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from datastructer import Point
+from delaunay import DelaunayEngine
+from voronoi_engine import VoronoiEngine
+
+
+def edge_sites(vd):
+    """以兩個 site 表示每條邊，與建構方式無關"""
+    return sorted(tuple(sorted(((e.site1.x, e.site1.y), (e.site2.x, e.site2.y)))) for e in vd.edges)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_duplicates_are_dropped(seed):
+    r = random.Random(seed)
+    unique = list({(r.randint(0, 600), r.randint(0, 600)) for _ in range(40)})
+    points = [Point(x, y) for x, y in unique + r.choices(unique, k=30)]
+    r.shuffle(points)
+    vd = VoronoiEngine().build_voronoi(points)
+    assert sorted((p.x, p.y) for p in vd.points) == sorted(unique)
+    assert edge_sites(vd) == edge_sites(DelaunayEngine().build(points))
+
+
+@pytest.mark.parametrize("direction", [(1, 0), (0, 1), (1, 1), (7, -3), (0.5, 0.25)])
+def test_collinear_input(direction):
+    dx, dy = direction
+    r = random.Random(0)
+    steps = r.sample(range(-50, 50), 30)
+    points = [Point(100 + k * dx, 100 + k * dy) for k in steps + steps[:5]]
+    vd = VoronoiEngine().build_voronoi(points)
+    # n - 1 條互相平行的中垂線，沒有 Voronoi vertex
+    assert len(vd.edges) == len(steps) - 1
+    assert all(v.sites is None for v in vd.vertices)
+    for e in vd.edges:
+        ex, ey = e.end_vertex.x - e.start_vertex.x, e.end_vertex.y - e.start_vertex.y
+        assert abs(ex * dx + ey * dy) <= 1e-9 * (abs(ex) + abs(ey)) * (abs(dx) + abs(dy))
+    assert edge_sites(vd) == edge_sites(DelaunayEngine().build(points))
+
+
+def test_nearly_collinear_goes_through_merge():
+    # 只有一個點離開直線，不能被當成共線
+    points = [Point(10 * k, 5 * k) for k in range(20)] + [Point(101, 50)]
+    vd = VoronoiEngine().build_voronoi(points)
+    assert any(v.sites is not None for v in vd.vertices)
+    assert edge_sites(vd) == edge_sites(DelaunayEngine().build(points))
+
+
+def test_collinear_recorded_as_one_step():
+    points = [Point(10 * k, 20) for k in range(12)]
+    steps = []
+    vd = VoronoiEngine().build_voronoi(points, record_steps=True, all_steps=steps)
+    assert len(steps) == 1
+    assert edge_sites(steps[0].voronoi_diagram) == edge_sites(vd)
@@ -0,0 +1,69 @@
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import voronoi_engine
+from datastructer import Point, VoronoiDiagram
+from voronoi_engine import VoronoiEngine
+
+
+def random_points(n, seed):
+    r = random.Random(seed)
+    return [Point(r.uniform(0, 600), r.uniform(0, 600)) for _ in range(n)]
+
+
+def diagram_signature(vd):
+    """邊依原本的順序，端點座標、life 與凸包都要完全相同"""
+    def vertex(v):
+        return (v.x, v.y) if v is not None else None
+    edges = [((e.site1.x, e.site1.y), (e.site2.x, e.site2.y), vertex(e.start_vertex), vertex(e.end_vertex), e.life)
+             for e in vd.edges]
+    return edges, sorted(vertex(v) for v in vd.vertices), [(p.x, p.y) for p in vd.hull.points]
+
+
+class CountingPool(ProcessPoolExecutor):
+    submitted = 0
+
+    def submit(self, *args, **kwargs):
+        CountingPool.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_parallel_matches_serial(monkeypatch, seed):
+    # 把門檻調小，讓小輸入也真的走行程池
+    monkeypatch.setattr(VoronoiEngine, "PARALLEL_MIN_POINTS", 8)
+    monkeypatch.setattr(voronoi_engine, "ProcessPoolExecutor", CountingPool)
+    CountingPool.submitted = 0
+    points = random_points(120, seed)
+    parallel = VoronoiEngine().build(points, workers=4)
+    assert CountingPool.submitted == 4
+    assert diagram_signature(parallel) == diagram_signature(VoronoiEngine().build(points))
+
+
+def test_parallel_below_cutoff_runs_one_task(monkeypatch):
+    monkeypatch.setattr(voronoi_engine, "ProcessPoolExecutor", CountingPool)
+    CountingPool.submitted = 0
+    points = random_points(50, 7)
+    parallel = VoronoiEngine().build(points, workers=4)
+    assert CountingPool.submitted == 1
+    assert diagram_signature(parallel) == diagram_signature(VoronoiEngine().build(points))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_compact_round_trip(seed):
+    # 合併前的子問題結果（含已死的邊）經過 pickle 後要完整還原
+    points = sorted(random_points(60, seed), key=lambda p: (p.x, p.y))
+    vd = VoronoiEngine().build_voronoi_range(points, 0, len(points))
+    data = pickle.loads(pickle.dumps(vd.to_compact()))
+    restored = VoronoiDiagram.from_compact(data)
+    assert restored.to_compact() == vd.to_compact()
+    assert diagram_signature(restored) == diagram_signature(vd)
+    # 還原後可以直接再 merge（merge 會改動輸入，所以兩邊各自建立右半部分）
+    more = sorted((Point(p.x + 600, p.y) for p in random_points(60, seed + 100)), key=lambda p: (p.x, p.y))
+    engine = VoronoiEngine()
+    merged = engine.merge_voronoi(restored, engine.build_voronoi_range(more, 0, len(more)))
+    expected = engine.merge_voronoi(vd, engine.build_voronoi_range(more, 0, len(more)))
+    assert diagram_signature(merged) == diagram_signature(expected)
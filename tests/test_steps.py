@@ -0,0 +1,114 @@
+import random
+import threading
+
+import pytest
+
+from datastructer import Point, VoronoiEdge
+from voronoi_engine import VoronoiEngine
+
+
+def random_points(n, seed):
+    r = random.Random(seed)
+    return [Point(r.uniform(0, 600), r.uniform(0, 600)) for _ in range(n)]
+
+
+def step_signature(step):
+    """以每一步重建出的圖表示該步，比對不同建構方式的結果"""
+    vd = step.voronoi_diagram
+    edges = sorted((tuple(sorted(((e.site1.x, e.site1.y), (e.site2.x, e.site2.y)))),
+                    (e.start_vertex.x, e.start_vertex.y) if e.start_vertex else None,
+                    (e.end_vertex.x, e.end_vertex.y) if e.end_vertex else None,
+                    bool(e.is_hyperplane)) for e in vd.edges)
+    return step.step_number, step.description, edges
+
+
+def recorded_steps(points):
+    steps = []
+    VoronoiEngine().build_voronoi(points, record_steps=True, all_steps=steps)
+    return [step_signature(step) for step in steps]
+
+
+def diagram_signature(vd):
+    return sorted((tuple(sorted(((e.site1.x, e.site1.y), (e.site2.x, e.site2.y)))),
+                   (e.start_vertex.x, e.start_vertex.y), (e.end_vertex.x, e.end_vertex.y)) for e in vd.edges)
+
+
+@pytest.mark.parametrize("n", range(2, 31))
+def test_recorded_build_matches_plain_build(n):
+    # Run 與 Step by Step 走同一套遞迴，最後的圖要完全相同
+    for seed in range(3):
+        points = random_points(n, 100 * n + seed)
+        recorded = VoronoiEngine().build_voronoi(points, record_steps=True, all_steps=[])
+        assert diagram_signature(recorded) == diagram_signature(VoronoiEngine().build_voronoi(points))
+
+
+def test_concurrent_recording_builds():
+    point_sets = [random_points(150, seed) for seed in range(2)]
+    expected = [recorded_steps(points) for points in point_sets]
+
+    barrier = threading.Barrier(len(point_sets))
+    results = [None] * len(point_sets)
+    errors = []
+
+    def worker(i):
+        try:
+            barrier.wait()
+            steps = []
+            for step in VoronoiEngine().iter_build_steps(point_sets[i]):
+                steps.append(step)
+            results[i] = [step_signature(step) for step in steps]
+        except Exception as e:  # 交給主執行緒報告
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(point_sets))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert results == expected
+
+
+def test_interleaved_step_generators():
+    point_sets = [random_points(40, seed) for seed in (10, 11)]
+    expected = [recorded_steps(points) for points in point_sets]
+
+    generators = [VoronoiEngine().iter_build_steps(points) for points in point_sets]
+    collected = [[] for _ in generators]
+    active = list(range(len(generators)))
+    while active:
+        for i in list(active):
+            try:
+                collected[i].append(next(generators[i]))
+            except StopIteration:
+                active.remove(i)
+
+    assert [[step_signature(step) for step in steps] for steps in collected] == expected
+
+
+def test_abandoned_generator_leaves_no_hook():
+    points = random_points(60, 3)
+    expected = recorded_steps(points)
+
+    generator = VoronoiEngine().iter_build_steps(points)
+    first = [next(generator) for _ in range(5)]
+    # 暫停中的產生器不能留下任何記錄設定
+    assert VoronoiEdge._changed.get() is None
+    generator.close()
+    assert VoronoiEdge._changed.get() is None
+
+    # 已產生的步驟仍可重建，之後的建構不受影響
+    assert [step_signature(step) for step in first] == expected[:5]
+    assert recorded_steps(points) == expected
+
+
+def test_recording_build_does_not_leave_tracing_on():
+    points = random_points(30, 4)
+    recorded_steps(points)
+    assert VoronoiEdge._trace.get() is None
+
+    # 之後的一般建構不記錄調試資訊
+    vd = VoronoiEngine().build_voronoi(points)
+    assert VoronoiEdge._trace.get() is None
+    assert all(e.get_debug('is_original_bisector') is None for e in vd.edges)
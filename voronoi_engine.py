@@ -0,0 +1,1094 @@
+#演算法部分：不依賴 tkinter 的 Voronoi Diagram 引擎
+#所有每次建構的狀態都放在區域變數或 MergeContext 中，同一個 VoronoiEngine 可以被多個執行緒同時使用
+from datastructer import *
+from predicates import orient2d, inner2d, incircle
+from fortune_engine import FortuneEngine
+from delaunay import DelaunayEngine
+from voronoi_log import merge_log, truncate_log, life_log
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import math
+import weakref
+
+# 儲存merge步驟狀態的類
+# 步驟的圖：StepView 由 StepLog 重播事件重建，其他（步驟專用的暫時小圖）直接保存
+def _step_diagram(diagram):
+    return diagram.diagram() if isinstance(diagram, StepView) else diagram
+
+
+class MergeStep:
+    def __init__(self, step_number, description, voronoi_diagram, 
+                 left_hull=None, right_hull=None, merged_hull=None, 
+                 debug_A=None, debug_B=None):
+        self.step_number = step_number
+        self.description = description
+        self._diagram = voronoi_diagram
+        # 凸包與切線端點只有 O(h) 個點，Point 建立後不會再改變，淺拷貝即可
+        self.left_hull = list(left_hull) if left_hull else []
+        self.right_hull = list(right_hull) if right_hull else []
+        self.merged_hull = list(merged_hull) if merged_hull else []
+        self.debug_A = debug_A
+        self.debug_B = debug_B
+
+    @property
+    def voronoi_diagram(self):
+        return _step_diagram(self._diagram)
+
+    @property
+    def hyperplanes(self):
+        """橙色邊（merge產生的）"""
+        return [edge for edge in self.voronoi_diagram.edges if edge.is_hyperplane]
+
+    @property
+    def non_hyperplanes(self):
+        """藍色邊（原有的）"""
+        return [edge for edge in self.voronoi_diagram.edges if not edge.is_hyperplane]
+
+class BuildStep:
+    def __init__(self, step_number, description, voronoi_diagram, side="", points=None):
+        self.step_number = step_number
+        self.description = description
+        self._diagram = voronoi_diagram
+        self.side = side  # "left" 或 "right" 或 ""
+        self.points = list(points) if points else []
+
+    @property
+    def voronoi_diagram(self):
+        return _step_diagram(self._diagram)
+
+
+class StepView:
+    """某個步驟看到的圖：StepLog 前 position 個事件之後，兩個 site 都在 [lo, hi) 範圍內的邊"""
+    __slots__ = ('log', 'position', 'lo', 'hi')
+
+    def __init__(self, log, position, lo, hi):
+        self.log = log
+        self.position = position
+        self.lo = lo
+        self.hi = hi
+
+    def diagram(self):
+        return self.log.diagram(self.position, self.lo, self.hi)
+
+
+class StepLog:
+    """記錄步驟用的事件紀錄，取代每一步深拷貝整張圖
+
+    建構時只記下改變的部分：邊的新增、截斷（端點改變）、移除，以及 merge 開始時清除的
+    hyperplane 標記；步驟本身只保存事件的位置與 site 的索引範圍（StepView）。
+    要顯示某一步時才重播事件重建該步的圖，往後一步一步看時從上次重播的位置接著播。
+
+    事件格式：
+        ("edge", id, i1, i2, sx, sy, ex, ey, is_hyperplane)  新增或更新一條邊（i1、i2 為 site 索引）
+        ("remove", id)                                       移除一條邊
+        ("unmark", lo, hi)                                   清除範圍內所有邊的 hyperplane 標記
+    """
+
+    def __init__(self, sorted_points):
+        self.points = sorted_points
+        self.index = {p: i for i, p in enumerate(sorted_points)}
+        self.events = []
+        self._ids = {}          # 記錄中的邊 -> id（只在建構期間使用）
+        self._next_id = 0
+        self._changed = set()   # 由 VoronoiEdge 的 set_start_vertex / set_end_vertex 填入
+        self._trace = weakref.WeakKeyDictionary()  # 這次建構的邊調試資訊（VoronoiEdge.set_debug）
+        self._tokens = None
+        self._replay = None     # (position, {id: 邊的狀態})，重播到一半的狀態
+        self._cached = None     # (position, lo, hi, VoronoiDiagram)，最後一次重建的圖
+
+    def start(self):
+        """在目前的執行環境開始追蹤邊的端點改變與調試資訊（建構進行中）；必須在同一個執行環境呼叫 stop"""
+        self._tokens = (VoronoiEdge.track_changes(self._changed), VoronoiEdge.set_tracing(self._trace))
+
+    def stop(self):
+        """暫停追蹤（建構暫停或結束），還原原本的設定"""
+        if self._tokens is not None:
+            changed_token, trace_token = self._tokens
+            VoronoiEdge.reset_tracing(trace_token)
+            VoronoiEdge.untrack_changes(changed_token)
+            self._tokens = None
+
+    def close(self):
+        """建構結束：丟掉邊物件的參照，之後只保留事件"""
+        self.flush()
+        self._ids = {}
+        self._changed = set()
+        self._trace = weakref.WeakKeyDictionary()
+
+    def _span(self, points):
+        # 每一步的點都是排序後陣列上連續的一段
+        return self.index[points[0]], self.index[points[-1]] + 1
+
+    def _edge_event(self, edge_id, edge):
+        start, end = edge.start_vertex, edge.end_vertex
+        self.events.append(("edge", edge_id, self.index[edge.site1], self.index[edge.site2],
+                            start.x if start else None, start.y if start else None,
+                            end.x if end else None, end.y if end else None,
+                            edge.is_hyperplane))
+
+    def add_edges(self, edges):
+        for edge in edges:
+            edge_id = self._next_id
+            self._next_id += 1
+            self._ids[edge] = edge_id
+            self._changed.discard(edge)
+            self._edge_event(edge_id, edge)
+
+    def remove_edges(self, edges):
+        for edge in edges:
+            edge_id = self._ids.pop(edge, None)
+            if edge_id is not None:
+                self.events.append(("remove", edge_id))
+
+    def clear_hyperplanes(self, points):
+        self.events.append(("unmark",) + self._span(points))
+
+    def flush(self):
+        """把端點改變過的邊寫成事件；還沒加入記錄的邊（暫時的 midAB 等）略過"""
+        for edge in self._changed:
+            edge_id = self._ids.get(edge)
+            if edge_id is not None:
+                self._edge_event(edge_id, edge)
+        self._changed.clear()
+
+    def view(self, points):
+        self.flush()
+        return StepView(self, len(self.events), *self._span(points))
+
+    def diagram(self, position, lo, hi):
+        """重播前 position 個事件，重建 [lo, hi) 範圍的 VoronoiDiagram"""
+        if self._cached and self._cached[:3] == (position, lo, hi):
+            return self._cached[3]
+        if self._replay is None or self._replay[0] > position:
+            self._replay = (0, {})
+        done, state = self._replay
+        for event in self.events[done:position]:
+            kind = event[0]
+            if kind == "edge":
+                state[event[1]] = event[2:]
+            elif kind == "remove":
+                del state[event[1]]
+            else:
+                _, unmark_lo, unmark_hi = event
+                for edge_id, s in state.items():
+                    if s[6] and unmark_lo <= s[0] < unmark_hi and unmark_lo <= s[1] < unmark_hi:
+                        state[edge_id] = s[:6] + (False,)
+        self._replay = (position, state)
+
+        vd = VoronoiDiagram()
+        vd.points = self.points[lo:hi]
+        for point in vd.points:
+            vd.point_to_edges[point] = []
+        vertices = {}
+
+        def vertex_at(x, y):
+            vertex = vertices.get((x, y))
+            if vertex is None:
+                vertex = vertices[(x, y)] = VoronoiVertex(x, y)
+                vd.add_vertex(vertex)
+            return vertex
+
+        for i1, i2, sx, sy, ex, ey, is_hyperplane in state.values():
+            if lo <= i1 < hi and lo <= i2 < hi:
+                edge = VoronoiEdge(self.points[i1], self.points[i2], is_hyperplane=is_hyperplane)
+                if sx is not None:
+                    edge.set_start_vertex(vertex_at(sx, sy))
+                if ex is not None:
+                    edge.set_end_vertex(vertex_at(ex, ey))
+                vd.add_edge(edge)
+        self._cached = (position, lo, hi, vd)
+        return vd
+
+
+# 單次merge使用的工作狀態（原本掛在 GUI 物件上的 self.xxx）
+class MergeContext:
+    def __init__(self):
+        # 本次merge被截斷改變的端點（都在 chain 的另一側）與被 chain 穿過的邊
+        self.truncated_vertices = []
+        self.crossed_edges = set()
+        # 調試資訊（凸包與上切線端點）
+        self.left_hull = []
+        self.right_hull = []
+        self.merged_hull = []
+        self.debug_A = None
+        self.debug_B = None
+
+
+def _build_range_compact(coords):
+    """行程池中執行：以 Divide & Conquer 建立已排序點集的 Voronoi Diagram，回傳精簡形式"""
+    points = [Point(x, y) for x, y in coords]
+    vd = VoronoiEngine().build_voronoi_range(points, 0, len(points))
+    return vd.to_compact()
+
+
+# Divide & Conquer 演算法本體
+class VoronoiEngine:
+    """不含GUI的Voronoi引擎，輸入點列表，回傳 VoronoiDiagram
+
+    引擎本身不保存任何可變狀態，可重複使用，也可以在多個執行緒中同時呼叫
+    """
+
+    # 平行模式下，子問題至少要有這麼多點才交給行程池（太小的子問題傳輸成本比計算還高）
+    PARALLEL_MIN_POINTS = 1024
+
+    def build(self, points, record_steps=False, all_steps=None, algorithm="divide", workers=None, storage="objects"):
+        """建立 Voronoi Diagram 的入口，points 可以是 Point 或 (x, y)
+        
+        algorithm: "divide"（Divide & Conquer，可記錄步驟）、"fortune"（sweep line）
+                   或 "delaunay"（先建 Delaunay triangulation 再取對偶，結果附帶 vd.triangulation）；
+                   後兩者不記錄步驟
+        workers: Divide & Conquer 使用的行程數，大於 1 時上層的左右子問題平行建立；
+                 記錄步驟時一律單一行程
+        storage: "objects" 回傳 VoronoiDiagram；"arrays" 回傳 VoronoiArrays（整數 id 與型別陣列，
+                 delaunay 直接寫入陣列，其他演算法建好後再轉換）
+        """
+        if storage not in ("objects", "arrays"):
+            raise ValueError(f"未知的儲存方式: {storage}")
+        points = [p if isinstance(p, Point) else Point(*p) for p in points]
+        if not points:
+            return VoronoiDiagram() if storage == "objects" else VoronoiArrays()
+        if storage == "arrays" and algorithm == "delaunay":
+            return DelaunayEngine().build_arrays(points)
+        if algorithm == "divide" and workers and workers > 1 and not record_steps:
+            vd = self.build_voronoi_parallel(points, workers)
+        elif algorithm == "divide":
+            vd = self.build_voronoi(points, record_steps, all_steps=all_steps)
+        elif algorithm == "fortune":
+            vd = FortuneEngine().build(points)
+        elif algorithm == "delaunay":
+            vd = DelaunayEngine().build(points)
+        else:
+            raise ValueError(f"未知的演算法: {algorithm}")
+        if storage == "arrays":
+            return VoronoiArrays.from_diagram(vd)
+        # 最終結果建立半邊結構，之後的 cell 走訪、鄰居查詢都不必掃描整個邊列表
+        vd.build_half_edges()
+        return vd
+
+    # 建立Voronoi Diagram
+    def build_voronoi(self, points, record_steps=False, step_counter=None, all_steps=None):
+        if record_steps:
+            # 記錄步驟：把 iter_build_steps 產生的步驟全部收集起來
+            if all_steps is None:
+                all_steps = []  # 用於儲存所有步驟
+            steps = self.iter_build_steps(points, step_counter)
+            while True:
+                try:
+                    all_steps.append(next(steps))
+                except StopIteration as stop:
+                    return stop.value
+        
+        sorted_points, collinear = self.normalize_points(points)
+        if collinear and len(sorted_points) >= 3:
+            return self.build_voronoi_collinear(sorted_points)
+        return self.build_voronoi_range(sorted_points, 0, len(sorted_points))
+
+    def iter_build_steps(self, points, step_counter=None):
+        """build_voronoi(record_steps=True) 的產生器版本：每個 BuildStep / MergeStep 一產生就 yield，
+        使用者要下一步時才繼續建構，只看前幾步時不必建完整張圖
+
+        產生器結束時的回傳值（StopIteration.value）為最終的 VoronoiDiagram。
+        """
+        if step_counter is None:
+            step_counter = [0]  # 使用列表來確保可以修改
+        sorted_points, collinear = self.normalize_points(points)
+        
+        # 步驟只記錄改變的部分，要顯示時再由 step_log 重建；邊的調試資訊也只記在這次建構的 step_log
+        step_log = StepLog(sorted_points)
+        if collinear and len(sorted_points) >= 3:
+            steps = self.iter_collinear_steps(sorted_points, step_counter, step_log)
+        else:
+            steps = self.iter_voronoi_range(sorted_points, 0, len(sorted_points), step_counter, step_log)
+        try:
+            while True:
+                # 只在建構進行時追蹤邊的改變，暫停等待下一步的期間不影響其他建構
+                step_log.start()
+                try:
+                    step = next(steps)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    step_log.stop()
+                yield step
+        finally:
+            # 產生器被 close（或沒跑完就被回收）時也會執行：結束內層的建構並丟掉邊的參照
+            steps.close()
+            step_log.close()
+
+    def iter_collinear_steps(self, sorted_points, step_counter, step_log):
+        """全部共線時只有一個步驟"""
+        vd = self.build_voronoi_collinear(sorted_points)
+        step_counter[0] += 1
+        step_log.add_edges(vd.edges)
+        yield BuildStep(step_counter[0], f"全部 {len(sorted_points)} 個點共線：相鄰兩點的中垂線互相平行", step_log.view(sorted_points), "", sorted_points)
+        return vd
+
+    def normalize_points(self, points):
+        """Divide 前的前處理：去除重複的點並只排序一次，同時判斷是否全部共線
+
+        依 (x, y) 字典序排序，X相同時以Y決定先後，讓切割結果固定；
+        共線用精確的 orient2d 判斷，與排序後的第一個、最後一個點共線即為全部共線。
+        回傳 (sorted_points, collinear)。
+        """
+        sorted_points = sorted(dict.fromkeys(points), key=lambda p: (p.x, p.y))
+        if len(sorted_points) < 3:
+            return sorted_points, True
+        first, last = sorted_points[0], sorted_points[-1]
+        collinear = all(orient2d(first, last, p) == 0 for p in sorted_points[1:-1])
+        return sorted_points, collinear
+
+    def build_voronoi_collinear(self, sorted_points, extension=2000):
+        """全部共線時直接得到答案：沿直線排序後，相鄰兩點的中垂線就是全部的 n-1 條邊"""
+        vd = VoronoiDiagram()
+        for point in sorted_points:
+            vd.add_point(point)
+        for a, b in zip(sorted_points, sorted_points[1:]):
+            start, end = VoronoiEdge.get_perpendicular_bisector_unlimited(a, b, extension)
+            edge = VoronoiEdge(a, b)
+            edge.set_start_vertex(start)
+            edge.set_end_vertex(end)
+            vd.add_vertex(start)
+            vd.add_vertex(end)
+            vd.add_edge(edge)
+        vd.hull = ConvexHull.from_points(sorted_points)
+        return vd
+
+    def build_voronoi_parallel(self, points, workers):
+        """以行程池平行建立：上層切出最多 workers 個子問題交給子行程，回來後在本行程依序 merge
+
+        切割方式與 build_voronoi_range 相同，結果與單一行程建立的圖一致。
+        """
+        sorted_points, collinear = self.normalize_points(points)
+        if collinear and len(sorted_points) >= 3:
+            return self.build_voronoi_collinear(sorted_points)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tree = self._submit_range(pool, sorted_points, 0, len(sorted_points), workers)
+            return self._merge_submitted(sorted_points, tree)
+
+    def _submit_range(self, pool, sorted_points, lo, hi, tasks):
+        """把 [lo, hi) 切成最多 tasks 個子問題送進行程池，回傳之後 merge 用的樹"""
+        mid = lo + (hi - lo) // 2
+        if tasks <= 1 or mid - lo < self.PARALLEL_MIN_POINTS:
+            coords = [(p.x, p.y) for p in sorted_points[lo:hi]]
+            return ("leaf", lo, hi, pool.submit(_build_range_compact, coords))
+        left = self._submit_range(pool, sorted_points, lo, mid, tasks // 2)
+        right = self._submit_range(pool, sorted_points, mid, hi, tasks - tasks // 2)
+        return ("merge", left, right)
+
+    def _merge_submitted(self, sorted_points, node):
+        if node[0] == "leaf":
+            _, lo, hi, future = node
+            # 子行程回傳精簡形式，還原時直接使用本行程的 Point 物件
+            return VoronoiDiagram.from_compact(future.result(), sorted_points[lo:hi])
+        _, left, right = node
+        left_vd = self._merge_submitted(sorted_points, left)
+        right_vd = self._merge_submitted(sorted_points, right)
+        return self.merge_voronoi(left_vd, right_vd)
+
+    def build_voronoi_range(self, sorted_points, lo, hi):
+        """在共用的已排序陣列上，以索引範圍 [lo, hi) 遞迴建立 Voronoi Diagram（不記錄步驟）"""
+        # 計算總共有多少點
+        total_points = hi - lo
+        
+        # 基礎情況：點數量 <= 3
+        if total_points <= 3:
+            return self.build_voronoi_base(sorted_points[lo:hi])
+        
+        # 依照X座標切為左右數量一樣的兩半：[lo, mid) 為左半部分，[mid, hi) 為右半部分
+        mid = lo + total_points // 2
+        
+        # Conquer：遞迴處理左右兩部分
+        left_vd = self.build_voronoi_range(sorted_points, lo, mid)
+        right_vd = self.build_voronoi_range(sorted_points, mid, hi)
+        
+        # Merge：合併左右子問題的結果
+        return self.merge_voronoi(left_vd, right_vd)
+
+    def iter_voronoi_range(self, sorted_points, lo, hi, step_counter, step_log):
+        """build_voronoi_range 的記錄版本：產生器，每記錄一個步驟就 yield，結束時回傳 [lo, hi) 的子圖"""
+        total_points = hi - lo
+        
+        # 基礎情況：點數量 <= 3
+        if total_points <= 3:
+            steps = []
+            vd = self.build_voronoi_base(sorted_points[lo:hi], True, step_counter, steps, step_log)
+            yield from steps
+            return vd
+        
+        mid = lo + total_points // 2
+        
+        left_vd = yield from self.iter_voronoi_range(sorted_points, lo, mid, step_counter, step_log)
+        
+        # 記錄左子圖構建步驟
+        if mid - lo > 1:
+            step_counter[0] += 1
+            yield BuildStep(step_counter[0], f"左子圖構建完成 ({mid - lo}個點)", step_log.view(left_vd.points), "left", sorted_points[lo:mid])
+        
+        right_vd = yield from self.iter_voronoi_range(sorted_points, mid, hi, step_counter, step_log)
+        
+        # 記錄右子圖構建步驟
+        if hi - mid > 1:
+            step_counter[0] += 1
+            yield BuildStep(step_counter[0], f"右子圖構建完成 ({hi - mid}個點)", step_log.view(right_vd.points), "right", sorted_points[mid:hi])
+        
+        # Merge：merge_voronoi 一次只記錄一個步驟
+        steps = []
+        merged_vd = self.merge_voronoi(left_vd, right_vd, True, step_counter, steps, step_log)
+        yield from steps
+        return merged_vd
+
+    def build_voronoi_base(self, points, record_steps=False, step_counter=None, all_steps=None, step_log=None):
+        """點數量 <= 3 的子圖，同時建立凸包，之後每層merge時縫合"""
+        total_points = len(points)
+        if total_points == 2:
+            vd = self.build_voronoi_two_points(points, record_steps, step_counter, all_steps, step_log)
+        elif total_points == 3:
+            vd = self.build_voronoi_three_points(points, record_steps, step_counter, all_steps, step_log)
+        else:
+            vd = VoronoiDiagram()
+            vd.points = points  # 設置點集
+            for point in points:
+                vd.point_to_edges[point] = []  # 為每個點初始化空列表
+            # 單點無需處理
+        
+        # 底層直接建立凸包，之後每層merge時縫合
+        vd.hull = ConvexHull.from_points(points)
+        return vd
+
+    #兩個點的處理
+    def build_voronoi_two_points(self, points, record_steps=False, step_counter=None, all_steps=None, step_log=None):
+        vd = VoronoiDiagram()
+        vd.points = points
+        for point in points:
+            vd.point_to_edges[point] = []
+        p1, p2 = points[0], points[1]
+        # 共點則不做任何處理
+        if p1.x == p2.x and p1.y == p2.y:
+            return vd
+        
+        # 記錄兩兩取中垂線步驟
+        if record_steps and step_counter and all_steps is not None:
+            step_counter[0] += 1
+            temp_vd = VoronoiDiagram()
+            temp_vd.points = points
+            for point in points:
+                temp_vd.point_to_edges[point] = []
+            
+            build_step = BuildStep(step_counter[0], f"兩點取中垂線：({p1.x}, {p1.y}) 和 ({p2.x}, {p2.y})", temp_vd, "", points)
+            all_steps.append(build_step)
+        
+        start, end = VoronoiEdge.get_perpendicular_bisector_unlimited(p1, p2)
+        edge = VoronoiEdge(p1, p2)
+        edge.set_start_vertex(start)
+        edge.set_end_vertex(end)
+        vd.add_vertex(start)
+        vd.add_vertex(end)
+        vd.add_edge(edge)
+        
+        # 記錄完成的兩點Voronoi圖
+        if record_steps and step_counter and all_steps is not None:
+            step_counter[0] += 1
+            step_log.add_edges(vd.edges)
+            build_step = BuildStep(step_counter[0], f"兩點Voronoi圖完成：({p1.x}, {p1.y}) 和 ({p2.x}, {p2.y})", step_log.view(points), "", points)
+            all_steps.append(build_step)
+        
+        return vd
+
+    #三個點的處理
+    #處理鈍角和銳角三角形的情況
+    def build_voronoi_three_points(self, points, record_steps=False, step_counter=None, all_steps=None, step_log=None):
+        vd = VoronoiDiagram()
+        vd.points = points
+        for point in points:
+            vd.point_to_edges[point] = []
+        p1, p2, p3 = points[0], points[1], points[2]
+        
+        # 記錄三點取中垂線步驟
+        if record_steps and step_counter and all_steps is not None:
+            step_counter[0] += 1
+            temp_vd = VoronoiDiagram()
+            temp_vd.points = points
+            for point in points:
+                temp_vd.point_to_edges[point] = []
+            
+            build_step = BuildStep(step_counter[0], f"三點取中垂線：({p1.x}, {p1.y}), ({p2.x}, {p2.y}), ({p3.x}, {p3.y})", temp_vd, "", points)
+            all_steps.append(build_step)
+        
+        # 判斷三點是否共線（精確判斷）
+        if orient2d(p1, p2, p3) == 0:
+            # 三點共線，僅求最遠兩點以外的兩條中垂線
+            d12 = (p1.x - p2.x)**2 + (p1.y - p2.y)**2
+            d23 = (p2.x - p3.x)**2 + (p2.y - p3.y)**2
+            d13 = (p1.x - p3.x)**2 + (p1.y - p3.y)**2
+            # 找出最遠的兩點
+            max_d = max(d12, d23, d13)
+            pairs = [(p1, p2), (p2, p3), (p3, p1)]
+            
+            # 記錄共線處理步驟
+            if record_steps and step_counter and all_steps is not None:
+                step_counter[0] += 1
+                temp_vd = VoronoiDiagram()
+                temp_vd.points = points
+                for point in points:
+                    temp_vd.point_to_edges[point] = []
+                
+                build_step = BuildStep(step_counter[0], f"三點共線處理：跳過最遠兩點的中垂線", temp_vd, "", points)
+                all_steps.append(build_step)
+            
+            for idx, (a, b) in enumerate(pairs):
+                d = (a.x - b.x)**2 + (a.y - b.y)**2
+                if d != max_d:
+                    start, end = VoronoiEdge.get_perpendicular_bisector_unlimited(a, b)
+                    edge = VoronoiEdge(a, b)
+                    edge.set_start_vertex(start)
+                    edge.set_end_vertex(end)
+                    vd.add_vertex(start)
+                    vd.add_vertex(end)
+                    vd.add_edge(edge)
+            
+            # 記錄共線完成步驟
+            if record_steps and step_counter and all_steps is not None:
+                step_counter[0] += 1
+                step_log.add_edges(vd.edges)
+                build_step = BuildStep(step_counter[0], f"三點共線Voronoi圖完成", step_log.view(points), "", points)
+                all_steps.append(build_step)
+            
+            return vd
+        
+        # 不共線，處理三條中垂線
+        vertex = self.calculate_circumcenter(p1, p2, p3)
+        
+        # 記錄計算外心步驟
+        if record_steps and step_counter and all_steps is not None:
+            step_counter[0] += 1
+            temp_vd = VoronoiDiagram()
+            temp_vd.points = points
+            for point in points:
+                temp_vd.point_to_edges[point] = []
+            if vertex:
+                temp_vd.add_vertex(vertex)
+            
+            description = f"計算外心：({vertex.x:.2f}, {vertex.y:.2f})" if vertex else "外心計算失敗（可能為鈍角三角形）"
+            build_step = BuildStep(step_counter[0], description, temp_vd, "", points)
+            all_steps.append(build_step)
+        
+        # 記錄原始中垂線步驟
+        if record_steps and step_counter and all_steps is not None:
+            step_counter[0] += 1
+            temp_vd = VoronoiDiagram()
+            temp_vd.points = points
+            for point in points:
+                temp_vd.point_to_edges[point] = []
+            if vertex:
+                temp_vd.add_vertex(vertex)
+            
+            # 添加三條完整的原始中垂線
+            pairs = [(p1, p2), (p2, p3), (p3, p1)]
+            for a, b in pairs:
+                start, end = VoronoiEdge.get_perpendicular_bisector_unlimited(a, b)
+                edge = VoronoiEdge(a, b)
+                edge.set_start_vertex(start)
+                edge.set_end_vertex(end)
+                # 標記為原始中垂線
+                edge.set_debug('is_original_bisector', True)
+                temp_vd.add_vertex(start)
+                temp_vd.add_vertex(end)
+                temp_vd.add_edge(edge)
+            
+            build_step = BuildStep(step_counter[0], f"原始兩兩中垂線：未經截斷的完整中垂線", temp_vd, "", points)
+            all_steps.append(build_step)
+        
+        # 檢查外心是否存在
+        circumcenter_valid = (vertex is not None)
+        
+        # 計算三邊長，找出最遠的兩點
+        def dist2(a, b):
+            return (a.x - b.x)**2 + (a.y - b.y)**2
+        
+        d12 = dist2(p1, p2)
+        d23 = dist2(p2, p3) 
+        d13 = dist2(p1, p3)
+        max_dist = max(d12, d23, d13)
+        
+        # 找出最遠的兩點
+        if max_dist == d12:
+            farthest_pair = (p1, p2)
+        elif max_dist == d23:
+            farthest_pair = (p2, p3)
+        else:
+            farthest_pair = (p1, p3)
+        
+        # 如果外心無效，只繪製兩兩接近的點，跳過最遠兩點
+        if not circumcenter_valid:
+            pairs = [(p1, p2), (p2, p3), (p3, p1)]
+            for a, b in pairs:
+                # 跳過最遠的兩點
+                if (a, b) == farthest_pair or (b, a) == farthest_pair:
+                    continue
+                    
+                start, end = VoronoiEdge.get_perpendicular_bisector_unlimited(a, b)
+                edge = VoronoiEdge(a, b)
+                edge.set_start_vertex(start)
+                edge.set_end_vertex(end)
+                vd.add_vertex(start)
+                vd.add_vertex(end)
+                vd.add_edge(edge)
+        else:
+            # 外心有效：三條中垂線都從外心出發，往離第三點越來越遠的方向延伸
+            # （鈍角三角形最長邊的中垂線也是同樣的規則，方向用精確的 orient2d 判斷）
+            # 計算三角形三個角兩邊向量的內積，符號與 cos 值相同（只用在步驟說明）
+            # 角A在p1，角B在p2，角C在p3
+            cosA = inner2d(p1, p2, p3)
+            cosB = inner2d(p2, p1, p3)
+            cosC = inner2d(p3, p1, p2)
+            
+            vd.add_vertex(vertex)
+            for a, b, third in ((p1, p2, p3), (p2, p3, p1), (p3, p1, p2)):
+                edge = VoronoiEdge(a, b)
+                edge.set_start_vertex(vertex)
+                end = self.extend_away_from(vertex, a, b, third)
+                edge.set_end_vertex(end)
+                vd.add_vertex(end)
+                vd.add_edge(edge)
+        
+        # 記錄三點Voronoi圖完成步驟
+        if record_steps and step_counter and all_steps is not None:
+            step_counter[0] += 1
+            triangle_type = "鈍角" if (cosA < 0 or cosB < 0 or cosC < 0) else "銳角"
+            step_log.add_edges(vd.edges)
+            build_step = BuildStep(step_counter[0], f"三點{triangle_type}三角形Voronoi圖完成", step_log.view(points), "", points)
+            all_steps.append(build_step)
+        
+        return vd
+    
+
+    # 判斷點c是否在a和b之間（線段內部）
+    def is_between(a, b, c):
+        
+        cross = (c.x - a.x) * (b.x - a.x) + (c.y - a.y) * (b.y - a.y)
+        if cross < 0:
+            return False
+        dist_ab = (b.x - a.x)**2 + (b.y - a.y)**2
+        dist_ac = (c.x - a.x)**2 + (c.y - a.y)**2
+        return dist_ac <= dist_ab
+    
+
+    def extend_away_from(self, vertex, a, b, third, extension=2000):
+        """從 vertex 沿 a、b 的中垂線往離 third 越來越遠的方向延伸出去的遠端點
+
+        沿 (b - a) 轉 90 度的方向前進時，orient2d(a, b, third) > 0 表示越來越靠近 third。
+        """
+        dx, dy = a.y - b.y, b.x - a.x
+        scale = (-extension if orient2d(a, b, third) > 0 else extension) / math.hypot(dx, dy)
+        return VoronoiVertex(vertex.x + dx * scale, vertex.y + dy * scale)
+
+    # 計算三點的外心（中垂線交點）
+    def calculate_circumcenter(self, p1, p2, p3):
+        
+        # 使用兩條中垂線的交點公式
+        ax, ay = p1.x, p1.y
+        bx, by = p2.x, p2.y
+        cx, cy = p3.x, p3.y
+        
+        if orient2d(p1, p2, p3) == 0:  # 三點共線
+            return None
+        d = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+        
+        ux = ((ax**2 + ay**2) * (by - cy) + (bx**2 + by**2) * (cy - ay) + (cx**2 + cy**2) * (ay - by)) / d
+        uy = ((ax**2 + ay**2) * (cx - bx) + (bx**2 + by**2) * (ax - cx) + (cx**2 + cy**2) * (bx - ax)) / d
+        
+        return VoronoiVertex(ux, uy, sites=(p1, p2, p3)) 
+    
+
+    #合併左右子問題
+    def merge_voronoi(self, left_vd, right_vd, record_steps=False, step_counter=None, all_steps=None, step_log=None):
+        if step_counter is None:
+            step_counter = [0]
+            
+        merged_vd = VoronoiDiagram()
+        
+        # 合併點集
+        merged_vd.points = left_vd.points + right_vd.points
+        for point in merged_vd.points:
+            merged_vd.point_to_edges[point] = []
+        
+        # 如果其中一個子問題為空，直接返回另一個
+        if not left_vd.points:
+            return right_vd
+        if not right_vd.points:
+            return left_vd
+        
+        # 在MERGE前，將左右子圖當中所有邊都設為非hyperplane
+        merge_log.debug('將所有現有邊設為非hyperplane（藍色）')
+        for edge in left_vd.edges:
+            edge.is_hyperplane = False
+        for edge in right_vd.edges:
+            edge.is_hyperplane = False
+        if merge_log.isEnabledFor(logging.DEBUG):
+            for edge in left_vd.edges:
+                merge_log.debug('左子圖邊: (%s, %s)-(%s, %s) 設為非hyperplane', edge.site1.x, edge.site1.y, edge.site2.x, edge.site2.y)
+            for edge in right_vd.edges:
+                merge_log.debug('右子圖邊: (%s, %s)-(%s, %s) 設為非hyperplane', edge.site1.x, edge.site1.y, edge.site2.x, edge.site2.y)
+        
+        # 暫不合併邊，等待迭代處理完成後再合併
+        # merged_vd.edges = left_vd.edges + right_vd.edges
+        # merged_vd.vertices = left_vd.vertices + right_vd.vertices
+        
+        # 每次 merge 建立獨立的 context，不共用狀態
+        # 邊生命值系統直接透過共用的 VoronoiVertex.edges 找到相接的邊，不需要事先註冊
+        ctx = MergeContext()
+        
+        # 1.左凸包字典序最大的點為A，右凸包字典序最小的點為B（兩者必定在凸包上）
+        A = left_vd.hull.rightmost
+        B = right_vd.hull.leftmost
+        
+        merge_log.debug('初始 A: (%s, %s), B: (%s, %s)', A.x, A.y, B.x, B.y)
+        
+        # 直接使用子圖遞迴帶上來的凸包，不再重新計算
+        left_points_on_hull = left_vd.hull.points
+        r = left_vd.hull.right_index
+        left_hull = left_points_on_hull[r::-1] + left_points_on_hull[:r:-1]  # 左側順時針，從A開始
+        right_hull = right_vd.hull.points[:]  # 右側逆時針，從B開始
+        
+        # 保存調試信息
+        ctx.left_hull = left_hull[:]
+        ctx.right_hull = right_hull[:]
+        
+        # 凸包列表只在開啟 merge 的 debug 時才輸出
+        if merge_log.isEnabledFor(logging.DEBUG):
+            merge_log.debug('左側凸包 (順時針，從A開始):')
+            for i, p in enumerate(left_hull):
+                marker = " ← A" if p == A else ""
+                merge_log.debug('  L%s: (%s, %s)%s', i, p.x, p.y, marker)
+            
+            merge_log.debug('右側凸包 (逆時針，從B開始):')
+            for i, p in enumerate(right_hull):
+                marker = " ← B" if p == B else ""
+                merge_log.debug('  R%s: (%s, %s)%s', i, p.x, p.y, marker)
+        
+        # 2. 在凸包上直接找出上下兩條切線（O(h)，保證收斂，不需要迭代上限）
+        tangents = ConvexHull.find_tangents(left_vd.hull, right_vd.hull)
+        (upper_a, upper_b), (lower_a, lower_b) = tangents
+        A = left_vd.hull.points[upper_a]
+        B = right_vd.hull.points[upper_b]
+        end_A = left_vd.hull.points[lower_a]
+        end_B = right_vd.hull.points[lower_b]
+        
+        merge_log.debug('上切線: A: (%s, %s), B: (%s, %s)', A.x, A.y, B.x, B.y)
+        merge_log.debug('下切線: A: (%s, %s), B: (%s, %s)', end_A.x, end_A.y, end_B.x, end_B.y)
+        
+        # 保存最終的A和B用於調試顯示
+        ctx.debug_A = A
+        ctx.debug_B = B
+        
+        # 3. 從上切線沿 dividing chain 走到下切線，途中截斷被 chain 穿過的邊
+        chain_edges = self.walk_dividing_chain(ctx, left_vd, right_vd, A, B, end_A, end_B)
+        merged_vd.edges.extend(chain_edges)
+        
+        # 4. 被截掉的舊端點都在 chain 的另一側，與它相接的邊整條落在另一側，生命值歸零
+        self.kill_cut_off_edges(ctx)
+        
+        # 合併結果
+        merge_log.debug('開始合併邊...')
+        merge_log.debug('合併前 left_vd 邊數: %s', len(left_vd.edges))
+        merge_log.debug('合併前 right_vd 邊數: %s', len(right_vd.edges))
+        
+        # 基於邊生命值系統清理死亡的邊
+        all_normal_edges = left_vd.edges + right_vd.edges
+        alive_edges = []
+        dead_edges = []
+        
+        for edge in all_normal_edges:
+            if edge.life > 0:
+                alive_edges.append(edge)
+            else:
+                dead_edges.append(edge)
+                # 死亡的邊從端點脫離，vertex 的 degree 只計算存活的邊
+                if edge.start_vertex:
+                    edge.start_vertex.remove_edge(edge)
+                if edge.end_vertex:
+                    edge.end_vertex.remove_edge(edge)
+        
+        merge_log.debug('\n🔄 清理結果: 存活%s條，死亡%s條', len(alive_edges), len(dead_edges))
+        
+        existing_midab_edges = [edge for edge in merged_vd.edges if hasattr(edge, 'is_hyperplane') and edge.is_hyperplane]
+        merged_vd.edges = alive_edges + existing_midab_edges
+        # 重建點到邊的對應，讓上一層merge可以直接取得每個cell的邊界
+        for edge in merged_vd.edges:
+            merged_vd.point_to_edges[edge.site1].append(edge)
+            merged_vd.point_to_edges[edge.site2].append(edge)
+        merge_log.debug('🎆 最終結果: %s條正常邊 + %s條midAB邊 = 總共%s條邊', len(alive_edges), len(existing_midab_edges), len(merged_vd.edges))
+        
+        # 合併頂點：只留仍有存活的邊相接的（被截掉的舊端點不再屬於這張圖），chain 的 vertex 也在其中
+        merged_vd.vertices = list(dict.fromkeys(vertex for edge in merged_vd.edges for vertex in (edge.start_vertex, edge.end_vertex)))
+        
+        # 以上下切線縫合左右凸包（O(h)），結果隨著子圖往上傳
+        merged_vd.hull = ConvexHull.merge(left_vd.hull, right_vd.hull, tangents=tangents)
+        ctx.merged_hull = merged_vd.hull.points[:]
+        
+        # 記錄merge步驟（如果啟用記錄模式）
+        if record_steps:
+            step_counter[0] += 1
+            step_description = f"Merge step {step_counter[0]}: Merging {len(left_vd.points)} left points with {len(right_vd.points)} right points"
+            
+            merge_log.debug('Step %s 邊的分類統計:', step_counter[0])
+            merge_log.debug('  - Hyperplane邊(深紅色+黃色): %s', len(existing_midab_edges))
+            merge_log.debug('  - 非Hyperplane邊(藍色): %s', len(alive_edges))
+            
+            # 只記錄這次merge改變的部分：清除舊的hyperplane標記、死亡的邊、新的midAB，
+            # 被截斷的邊由 step_log 從端點的改變得知
+            step_log.clear_hyperplanes(merged_vd.points)
+            step_log.remove_edges(dead_edges)
+            step_log.add_edges(existing_midab_edges)
+            merge_step = MergeStep(
+                step_number=step_counter[0],
+                description=step_description,
+                voronoi_diagram=step_log.view(merged_vd.points),
+                left_hull=left_hull,
+                right_hull=right_hull,
+                merged_hull=ctx.merged_hull,
+                debug_A=A,
+                debug_B=B
+            )
+            if all_steps is not None:
+                all_steps.append(merge_step)
+        
+        return merged_vd
+    
+    def calculate_slope(self, p1, p2):
+        """計算兩點連線的斜率"""
+        if p2.x == p1.x:
+            return float('inf')  # 垂直線
+        return (p2.y - p1.y) / (p2.x - p1.x)
+    
+    def is_clockwise_rotation(self, old_vector, new_vector):
+        """檢查是否為順時針旋轉（使用外積判斷）
+        
+        Args:
+            old_vector: 原線向量 (x, y)
+            new_vector: 新線向量 (x, y)
+            
+        Returns:
+            bool: 若 "新線向量" 外積 "原線向量" > 0，則為順時鐘
+        """
+        # 計算外積：new_vector × old_vector
+        cross_product = new_vector[0] * old_vector[1] - new_vector[1] * old_vector[0]
+        return cross_product > 0
+    
+    def is_counterclockwise_rotation(self, old_vector, new_vector):
+        """檢查是否為逆時針旋轉（使用外積判斷）
+        
+        Args:
+            old_vector: 原線向量 (x, y)
+            new_vector: 新線向量 (x, y)
+            
+        Returns:
+            bool: 若 "新線向量" 外積 "原線向量" < 0，則為逆時鐘
+        """
+        # 計算外積：new_vector × old_vector
+        cross_product = new_vector[0] * old_vector[1] - new_vector[1] * old_vector[0]
+        return cross_product < 0
+    
+    def is_valid_upper_tangent(self, left_point, right_point, hull_to_check):
+        """
+        檢查left_point到right_point的直線是否為有效的上切線
+        使用向量旋轉方向來判斷，而不是叉積
+        """
+        # 這個函數現在不再使用，保留為備用
+        return True
+    
+    def get_chain_direction(self, A, B):
+        """dividing chain 在 A（左）與 B（右）之間前進的單位方向
+        
+        (B - A) 旋轉 90 度，從上切線朝向下切線（畫面上往 Y 較大的一側）
+        """
+        dx = B.x - A.x
+        dy = B.y - A.y
+        length = (dx * dx + dy * dy) ** 0.5
+        return -dy / length, dx / length
+    
+    def get_chain_bisector(self, A, B, extension=2000):
+        """A、B 的中垂線兩個遠端點，依 chain 前進方向排列為 (起點, 終點)"""
+        ux, uy = self.get_chain_direction(A, B)
+        mx = (A.x + B.x) / 2
+        my = (A.y + B.y) / 2
+        return (VoronoiVertex(mx - ux * extension, my - uy * extension),
+                VoronoiVertex(mx + ux * extension, my + uy * extension))
+    
+    def extend_along_chain(self, start, A, B, extension=2000):
+        """從 start 沿著 A、B 中垂線的 chain 方向延伸出去的遠端點"""
+        ux, uy = self.get_chain_direction(A, B)
+        return VoronoiVertex(start.x + ux * extension, start.y + uy * extension)
+    
+    def walk_dividing_chain(self, ctx, left_vd, right_vd, A, B, end_A, end_B, extension=2000):
+        """從上切線 (A, B) 沿 dividing chain 走到下切線 (end_A, end_B)，回傳 chain 的各段 midAB
+
+        chain 在 A、B 兩個 cell 之間前進，下一個碰到的一定是這兩個 cell 的邊，
+        所以只看 A 在左子圖、B 在右子圖的鄰居，不計算線段交點：
+        鄰居 C 在 chain 前進的方向時（orient2d(A, B, C) > 0），chain 走到 A、B、C 的外心就碰到 C 的 cell，
+        哪個鄰居先碰到、左右哪一側先碰到都用精確的 incircle 判斷。
+        多點共圓時依序處理，共用同一個 vertex。
+        """
+        chain = []
+        current = None        # chain 目前所在的 vertex；還在上切線的射線上時為 None
+        previous_site = None  # current 的外接圓上，A、B 以外的一個 site
+        # chain 的每一段對應一條跨左右的 Delaunay 邊，數量不超過 2(|L| + |R|)；
+        # 同一個 site 的 cell 可能被 chain 經過兩次（中間繞過它的某個鄰居），同一條邊也可能被截斷兩次
+        for _ in range(2 * (len(left_vd.points) + len(right_vd.points))):
+            if A is end_A and B is end_B:
+                break
+            left_next = self.next_chain_site(left_vd, A, A, B)
+            right_next = self.next_chain_site(right_vd, B, A, B)
+            if left_next is None and right_next is None:
+                merge_log.warning('還沒到下切線就沒有可以碰到的邊，直接以射線結束')
+                break
+            # 右側的鄰居不在 A、B 與左側鄰居的外接圓內，表示左側先碰到（共圓時先處理左側）
+            on_left = right_next is None or (left_next is not None and incircle(A, B, left_next[0], right_next[0]) <= 0)
+            site, edge = left_next if on_left else right_next
+            
+            if current is not None and incircle(A, B, site, previous_site) == 0:
+                # 與上一個 vertex 共圓：chain 沒有前進，繼續使用同一個 vertex
+                vertex = current
+            else:
+                vertex = self.calculate_circumcenter(A, B, site)
+                segment = VoronoiEdge(A, B, is_hyperplane=True)
+                segment.set_start_vertex(current if current is not None else self.extend_along_chain(vertex, A, B, -extension))
+                segment.set_end_vertex(vertex)
+                chain.append(segment)
+                current = vertex
+            
+            merge_log.debug('chain 在 (%.2f, %.2f) 碰到%s的邊 (%s, %s)-(%s, %s)', vertex.x, vertex.y, '左側' if on_left else '右側', edge.site1.x, edge.site1.y, edge.site2.x, edge.site2.y)
+            if on_left:
+                self.clip_crossed_edge(ctx, edge, A, B, vertex, chain[-1], extension)
+                previous_site, A = A, site
+            else:
+                self.clip_crossed_edge(ctx, edge, B, A, vertex, chain[-1], extension)
+                previous_site, B = B, site
+        
+        # 最後一段：從最後一個 vertex（沒有碰到任何邊時為整條中垂線）往無限遠延伸
+        if current is None:
+            start, end = self.get_chain_bisector(A, B, extension)
+        else:
+            start, end = current, self.extend_along_chain(current, A, B, extension)
+        ray = VoronoiEdge(A, B, is_hyperplane=True)
+        ray.set_start_vertex(start)
+        ray.set_end_vertex(end)
+        chain.append(ray)
+        merge_log.debug('到達下切線 A: (%s, %s), B: (%s, %s)，chain 共 %s 段', A.x, A.y, B.x, B.y, len(chain))
+        return chain
+
+    def next_chain_site(self, vd, site, A, B):
+        """site 的 cell 中，chain 從 A、B 之間往前最先碰到的鄰居，回傳 (鄰居, 兩者之間的邊)，沒有則為 None"""
+        best = None
+        for edge in vd.point_to_edges.get(site, ()):
+            if edge.life <= 0:
+                continue
+            other = edge.site2 if edge.site1 is site else edge.site1
+            # 在 chain 後方或與 A、B 共線的鄰居永遠碰不到
+            if orient2d(A, B, other) <= 0:
+                continue
+            # 在 A、B 與目前最佳鄰居的外接圓內，表示更早碰到
+            if best is None or incircle(A, B, best[0], other) > 0:
+                best = (other, edge)
+        return best
+
+    def clip_crossed_edge(self, ctx, edge, site, other, vertex, hyperplane, extension=2000):
+        """chain 在 vertex 穿過 site 的 cell 的邊 edge：保留 site 這一側，截掉靠近 other 的一端
+
+        沿著 (鄰居 - site) 轉 90 度的方向前進時，orient2d(site, 鄰居, other) > 0 表示越來越靠近 other。
+        """
+        neighbor = edge.site2 if edge.site1 is site else edge.site1
+        rx, ry = site.y - neighbor.y, neighbor.x - site.x
+        start, end = edge.start_vertex, edge.end_vertex
+        along = (end.x - start.x) * rx + (end.y - start.y) * ry
+        toward_other = orient2d(site, neighbor, other) > 0
+        
+        edge.set_cross_info(vertex, hyperplane)
+        ctx.crossed_edges.add(edge)
+        if (along > 0) == toward_other:
+            cut, kept = end, start
+            edge.set_end_vertex(vertex)
+        else:
+            cut, kept = start, end
+            edge.set_start_vertex(vertex)
+        ctx.truncated_vertices.append(cut)
+        truncate_log.debug('截斷邊 (%s, %s)-(%s, %s)：(%.2f, %.2f) -> (%.2f, %.2f)', edge.site1.x, edge.site1.y, edge.site2.x, edge.site2.y, cut.x, cut.y, vertex.x, vertex.y)
+        
+        if kept.sites is None:
+            # 留下的一端是往無限遠延伸的遠端點：從新的 vertex 往遠離 other 的方向重新延伸
+            far = self.extend_away_from(vertex, site, neighbor, other, extension)
+            if kept is start:
+                edge.set_start_vertex(far)
+            else:
+                edge.set_end_vertex(far)
+        elif kept.x == vertex.x and kept.y == vertex.y:
+            # 多點共圓：保留的部分縮成一點，這條邊其實不存在
+            edge.life = 0
+            truncate_log.debug('截斷後縮成一點，邊死亡')
+
+    def kill_cut_off_edges(self, ctx):
+        """被截掉的舊端點在 chain 的另一側：與它相接、沒被 chain 穿過的邊整條都在另一側，
+        沿著相接的 vertex 一路往外，生命值全部歸零（O(死亡的邊數)）"""
+        stack = list(ctx.truncated_vertices)
+        visited = set()
+        while stack:
+            vertex = stack.pop()
+            if vertex in visited:
+                continue
+            visited.add(vertex)
+            for edge in vertex.edges:
+                if edge.life <= 0 or edge.is_hyperplane or edge in ctx.crossed_edges:
+                    continue
+                edge.life = 0
+                life_log.debug('💀 邊死亡: (%s, %s)-(%s, %s)', edge.site1.x, edge.site1.y, edge.site2.x, edge.site2.y)
+                stack.append(edge.end_vertex if edge.start_vertex is vertex else edge.start_vertex)
+
+    def is_tangent_improving_left(self, current_A, next_A, B, right_hull):
+        """
+        檢查左側點從current_A移到next_A是否改善上切線
+        對於上切線，右側凸包的所有其他點都應該在切線的下方或右側
+        """
+        # 檢查right_hull中的點是否都在next_A-B線段的下方
+        for point in right_hull:
+            if point == B:
+                continue
+                
+            # 計算外積：向量(next_A -> B) × 向量(next_A -> point)
+            # 如果結果 < 0，表示point在next_A-B線段的下方（右側），這是我們要的
+            # 如果結果 > 0，表示point在next_A-B線段的上方（左側），不符合上切線要求
+            cross = self.cross_product(next_A, B, point)
+            
+            # 對於上切線，所有右側凸包的點都應該在切線下方
+            if cross > 0:  # 點在線段上方，不是有效的上切線
+                return False
+                
+        return True
+    
+    def is_tangent_improving_right(self, A, current_B, next_B, left_hull):
+        """
+        檢查右側點從current_B移到next_B是否改善上切線
+        對於上切線，左側凸包的所有其他點都應該在切線的下方或左側
+        """
+        # 檢查left_hull中的點是否都在A-next_B線段的下方
+        for point in left_hull:
+            if point == A:
+                continue
+                
+            # 計算外積：向量(A -> next_B) × 向量(A -> point)  
+            # 如果結果 > 0，表示point在A-next_B線段的下方（左側），這是我們要的
+            # 如果結果 < 0，表示point在A-next_B線段的上方（右側），不符合上切線要求
+            cross = self.cross_product(A, next_B, point)
+            
+            # 對於上切線，所有左側凸包的點都應該在切線下方
+            if cross < 0:  # 點在線段上方，不是有效的上切線
+                return False
+                
+        return True
+    
+    def cross_product(self, p1, p2, p3):
+        """計算向量(p1->p2) × (p1->p3)的外積"""
+        return orient2d(p1, p2, p3)
+    
+    def cross_product(self, p1, p2, p3):
+        """計算向量(p1->p2) × (p1->p3)的叉積"""
+        return orient2d(p1, p2, p3)
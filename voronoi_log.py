@@ -0,0 +1,36 @@
+#記錄部分：用標準 logging 取代 print，分成合併、截斷、生命系統、繪圖四個子系統各自開關
+#訊息一律用 "%s" 格式加參數傳入，等級沒開時 logging 直接略過，不會組字串
+#預設不輸出任何東西；要看追蹤訊息時呼叫 configure() 或 set_level()
+import logging
+
+merge_log = logging.getLogger("voronoi.merge")
+truncate_log = logging.getLogger("voronoi.truncate")
+life_log = logging.getLogger("voronoi.life")
+render_log = logging.getLogger("voronoi.render")
+
+SUBSYSTEMS = {
+    "merge": merge_log,
+    "truncate": truncate_log,
+    "life": life_log,
+    "render": render_log,
+}
+
+_root = logging.getLogger("voronoi")
+_root.addHandler(logging.NullHandler())
+_root.setLevel(logging.WARNING)
+
+
+def set_level(level, *subsystems):
+    """設定子系統的等級，沒指定子系統時設定全部"""
+    for name in subsystems or SUBSYSTEMS:
+        SUBSYSTEMS[name].setLevel(level)
+
+
+def configure(level=logging.INFO, stream=None):
+    """把訊息輸出到 stream（預設 stderr），並設定全部子系統的等級"""
+    if not any(isinstance(h, logging.StreamHandler) for h in _root.handlers):
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _root.addHandler(handler)
+    _root.setLevel(level)
+    set_level(logging.NOTSET)